@@ -1,64 +1,52 @@
 #!/usr/bin/env python3
 """
 Script to calculate ELO ratings based on existing lap times.
-This simulates the ELO system by processing all lap times chronologically.
+This simulates the ELO system by ranking each driver's best lap on every track
+and scoring a virtual match between every pair of drivers on that track.
 """
 
 import sqlite3
 import sys
 import os
+from bisect import bisect_right
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from typing import Dict, List, Tuple
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+import numpy as np
 
-class DriverRating:
-    def __init__(self, user_id: str, username: str, current_elo: int = 1500):
-        self.user_id = user_id
-        self.username = username
-        self.current_elo = current_elo
-        self.peak_elo = current_elo
-        self.matches_played = 0
-        self.wins = 0
-        self.losses = 0
-        self.last_updated = datetime.now()
-    
-    def calculate_expected_score(self, opponent_elo: int) -> float:
-        """Calculate expected score against opponent using ELO formula."""
-        return 1.0 / (1.0 + 10.0 ** ((opponent_elo - self.current_elo) / 400.0))
-    
-    def update_after_match(self, opponent_elo: int, won: bool, k_factor: int = 32):
-        """Update ELO after a match."""
-        expected = self.calculate_expected_score(opponent_elo)
-        actual = 1.0 if won else 0.0
-        
-        # Calculate ELO change
-        elo_change = k_factor * (actual - expected)
-        self.current_elo = max(800, int(self.current_elo + elo_change))  # Min ELO 800
-        
-        # Update statistics
-        self.matches_played += 1
-        if won:
-            self.wins += 1
-        else:
-            self.losses += 1
-        
-        # Update peak
-        if self.current_elo > self.peak_elo:
-            self.peak_elo = self.current_elo
-        
-        self.last_updated = datetime.now()
+# The parent directory is the project root when the script is run from scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.entities.driver_rating import SKILL_LEVELS, SKILL_THRESHOLDS
+from src.infrastructure.persistence.sqlite_tuning import connect as _connect
+
+INITIAL_ELO = 1500
+MIN_ELO = 800
+K_FACTOR = 32
+# 10 ** (diff / 400) == exp(diff * ln(10) / 400)
+LN10_OVER_400 = np.log(10.0) / 400.0
+
+# Console decoration for each of the DriverRating skill levels
+SKILL_EMOJIS = ("🏁", "🌱", "📈", "🎯", "⚡", "🔥", "👑")
+SKILL_LABELS = tuple(f"{level} {emoji}" for level, emoji in zip(SKILL_LEVELS, SKILL_EMOJIS))
 
 def load_lap_times() -> List[Tuple]:
-    """Load all lap times ordered chronologically."""
-    conn = sqlite3.connect('data/lap_times.db')
+    """Load each driver's best time per track, grouped by track fastest-first.
+    
+    The ELO simulation only needs one entry per driver and track, so the
+    aggregation is done by SQLite instead of shipping every lap to Python.
+    """
+    conn = _connect('data/lap_times.db')
     cursor = conn.cursor()
     
     cursor.execute("""
-        SELECT user_id, username, track_key, total_milliseconds, created_at
+        SELECT track_key, user_id, username,
+               MIN(total_milliseconds) AS best_ms
         FROM lap_times 
-        ORDER BY created_at ASC
+        GROUP BY track_key, user_id
+        ORDER BY track_key, best_ms, user_id
     """)
     
     lap_times = cursor.fetchall()
@@ -66,29 +54,26 @@ def load_lap_times() -> List[Tuple]:
     
     return lap_times
 
-def get_latest_username_for_user(user_id: str) -> str:
-    """Get the most recent username for a user_id."""
-    conn = sqlite3.connect('data/lap_times.db')
+def get_latest_usernames() -> Dict[str, str]:
+    """Get the most recent username for every user_id in a single query."""
+    conn = _connect('data/lap_times.db')
     cursor = conn.cursor()
     
+    # SQLite returns the bare username column from the row holding MAX(created_at)
     cursor.execute("""
-        SELECT username FROM lap_times 
-        WHERE user_id = ? 
-        ORDER BY created_at DESC 
-        LIMIT 1
-    """, (user_id,))
+        SELECT user_id, username, MAX(created_at)
+        FROM lap_times 
+        GROUP BY user_id
+    """)
     
-    result = cursor.fetchone()
+    latest_usernames = {user_id: username for user_id, username, _ in cursor.fetchall()}
     conn.close()
     
-    return result[0] if result else "Unknown"
+    return latest_usernames
 
-def ensure_elo_table_exists():
+def ensure_elo_table_exists(conn: sqlite3.Connection):
     """Ensure the driver_ratings table exists."""
-    conn = sqlite3.connect('data/f1_lap_bot.db')
-    cursor = conn.cursor()
-    
-    cursor.execute("""
+    conn.execute("""
         CREATE TABLE IF NOT EXISTS driver_ratings (
             user_id TEXT PRIMARY KEY,
             username TEXT NOT NULL,
@@ -100,121 +85,107 @@ def ensure_elo_table_exists():
             last_updated TEXT NOT NULL
         )
     """)
-    
-    conn.commit()
-    conn.close()
 
-def save_driver_rating(rating: DriverRating):
-    """Save a driver rating to the database."""
-    ensure_elo_table_exists()
-    
-    conn = sqlite3.connect('data/f1_lap_bot.db')
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT OR REPLACE INTO driver_ratings 
-        (user_id, username, current_elo, peak_elo, matches_played, wins, losses, last_updated)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        rating.user_id,
-        rating.username,
-        rating.current_elo,
-        rating.peak_elo,
-        rating.matches_played,
-        rating.wins,
-        rating.losses,
-        rating.last_updated.isoformat()
-    ))
-    
-    conn.commit()
+def save_driver_ratings(ratings: List[Tuple]):
+    """Save all driver ratings to the database in a single transaction."""
+    conn = _connect('data/f1_lap_bot.db')
+    with conn:
+        ensure_elo_table_exists(conn)
+        conn.executemany("""
+            INSERT OR REPLACE INTO driver_ratings 
+            (user_id, username, current_elo, peak_elo, matches_played, wins, losses, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, ratings)
     conn.close()
 
 def calculate_elo_ratings():
     """Calculate ELO ratings for all drivers based on lap times."""
     print("🔄 Calculating ELO ratings based on lap times...")
     
-    # Load all lap times
+    # Load best lap per driver and track
     lap_times = load_lap_times()
     
-    # Initialize driver ratings
-    drivers: Dict[str, DriverRating] = {}
-    
-    # Process lap times chronologically
-    processed = 0
-    for user_id, username, track_key, total_ms, created_at in lap_times:
-        # Initialize driver if not exists
-        if user_id not in drivers:
-            drivers[user_id] = DriverRating(user_id, username)
-            print(f"📊 Initialized {username} with 1500 ELO")
-        
-        # Find all other drivers who have times on this track
-        # Create virtual matches against them
-        track_drivers = []
-        for other_user_id, other_rating in drivers.items():
-            if other_user_id != user_id:
-                # Check if other driver has a time on this track
-                # (This is a simplified approach - we assume they compete against all active drivers)
-                track_drivers.append(other_rating)
-        
-        # Simulate matches against other drivers based on relative performance
-        current_driver = drivers[user_id]
-        
-        for opponent in track_drivers:
-            # Determine who wins based on their track performance
-            # This is simplified - we assume the better overall ELO wins slightly more often
-            
-            # Use current ELO as proxy for performance
-            win_probability = current_driver.calculate_expected_score(opponent.current_elo)
+    # Assign every driver a dense index up front so the arrays below can be
+    # allocated once at their final size, and collect each track's
+    # participants (fastest first) in the same pass
+    user_index: Dict[str, int] = {}
+    usernames: List[str] = []
+    track_participants: Dict[str, np.ndarray] = {}
+    for track_key, entries in groupby(lap_times, key=itemgetter(0)):
+        participants = []
+        for _, user_id, username, _ in entries:
+            idx = user_index.get(user_id)
+            if idx is None:
+                idx = user_index[user_id] = len(user_index)
+                usernames.append(username)
+                print(f"📊 Initialized {username} with {INITIAL_ELO} ELO")
+            participants.append(idx)
+        track_participants[track_key] = np.array(participants)
+    
+    # Driver state is kept as parallel arrays indexed by user_index[user_id]
+    # so each driver's matches are evaluated in one vectorized step.
+    driver_count = len(user_index)
+    elo = np.full(driver_count, INITIAL_ELO, dtype=np.float64)
+    peak = elo.copy()
+    wins = np.zeros(driver_count, dtype=np.int32)
+    losses = np.zeros(driver_count, dtype=np.int32)
+    
+    # Drivers only race the drivers who set a time on the same track
+    for track_key, participants in track_participants.items():
+        # A lone driver has no matches, so the ratings cannot change
+        if participants.size > 1:
+            # Batched Elo update: every driver beats each slower driver, and all
+            # ratings on the track move simultaneously from their pre-track values
+            rating = elo[participants]
+            expected = 1.0 / (1.0 + np.exp((rating[None, :] - rating[:, None]) * LN10_OVER_400))
+            expected_score = expected.sum(axis=1) - 0.5  # drop the self-match on the diagonal
+            track_wins = np.arange(participants.size - 1, -1, -1)
             
-            # Add some randomness based on track time (better times = slightly higher win chance)
-            # Normalize time performance (faster = better)
-            time_bonus = max(0, min(0.2, (120000 - total_ms) / 500000))  # Small bonus for faster times
-            adjusted_win_prob = min(0.9, max(0.1, win_probability + time_bonus))
-            
-            # Simulate match result
-            import random
-            won = random.random() < adjusted_win_prob
-            
-            # Update both drivers
-            current_driver.update_after_match(opponent.current_elo, won)
-            opponent.update_after_match(current_driver.current_elo, not won)
+            elo[participants] = np.maximum(MIN_ELO, rating + K_FACTOR * (track_wins - expected_score))
+            peak[participants] = np.maximum(peak[participants], elo[participants])
+            wins[participants] += track_wins
+            losses[participants] += participants.size - 1 - track_wins
         
-        processed += 1
-        if processed % 10 == 0:
-            print(f"⚡ Processed {processed}/{len(lap_times)} lap times...")
+        drivers = "driver" if participants.size == 1 else "drivers"
+        print(f"⚡ Processed {track_key}: {participants.size} {drivers}")
     
     # Update usernames to latest before saving
     print("🔄 Updating usernames to latest versions...")
-    for user_id, driver in drivers.items():
-        latest_username = get_latest_username_for_user(user_id)
-        driver.username = latest_username
+    latest_usernames = get_latest_usernames()
+    for user_id, idx in user_index.items():
+        latest_username = latest_usernames.get(user_id, "Unknown")
+        usernames[idx] = latest_username
         print(f"👤 Updated {user_id} to username: {latest_username}")
     
     # Save all driver ratings
     print("💾 Saving ELO ratings to database...")
-    for driver in drivers.values():
-        save_driver_rating(driver)
-        skill_level = get_skill_level(driver.current_elo)
-        print(f"🏁 {driver.username}: {driver.current_elo} ELO ({skill_level}) - {driver.wins}W/{driver.losses}L")
-    
-    print(f"✅ ELO calculation complete! Processed {len(drivers)} drivers.")
+    last_updated = datetime.now().isoformat()
+    ratings = []
+    for user_id, idx in user_index.items():
+        current_elo = int(elo[idx])
+        driver_wins = int(wins[idx])
+        driver_losses = int(losses[idx])
+        ratings.append((
+            user_id,
+            usernames[idx],
+            current_elo,
+            int(peak[idx]),
+            driver_wins + driver_losses,
+            driver_wins,
+            driver_losses,
+            last_updated
+        ))
+    save_driver_ratings(ratings)
+    
+    for user_id, username, current_elo, _, _, driver_wins, driver_losses, _ in ratings:
+        skill_level = get_skill_level(current_elo)
+        print(f"🏁 {username}: {current_elo} ELO ({skill_level}) - {driver_wins}W/{driver_losses}L")
+    
+    print(f"✅ ELO calculation complete! Processed {len(user_index)} drivers.")
 
 def get_skill_level(elo: int) -> str:
     """Get skill level based on ELO rating."""
-    if elo >= 2200:
-        return "Legendary 👑"
-    elif elo >= 2000:
-        return "Master 🔥"
-    elif elo >= 1800:
-        return "Expert ⚡"
-    elif elo >= 1600:
-        return "Advanced 🎯"
-    elif elo >= 1400:
-        return "Intermediate 📈"
-    elif elo >= 1200:
-        return "Novice 🌱"
-    else:
-        return "Beginner 🏁"
+    return SKILL_LABELS[bisect_right(SKILL_THRESHOLDS, elo)]
 
 if __name__ == "__main__":
     calculate_elo_ratings()
@@ -15,7 +15,7 @@ import asyncio
 import sqlite3
 import sys
 import os
-from datetime import datetime
+import time
 
 # --- Setup paths to import from src ---
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -24,9 +24,7 @@ sys.path.insert(0, os.path.dirname(__file__))
 from src.infrastructure.persistence.sqlite_lap_time_repository import SQLiteLapTimeRepository
 from src.infrastructure.persistence.sqlite_driver_rating_repository import SQLiteDriverRatingRepository
 from src.application.use_cases.update_elo_ratings import UpdateEloRatingsUseCase
-from src.domain.entities.lap_time import LapTime
-from src.domain.value_objects.time_format import TimeFormat
-from src.domain.value_objects.track_name import TrackName
+from src.infrastructure.persistence.sqlite_tuning import connect
 
 # --- Database Paths ---
 # Determine the correct path - databases are in project root
@@ -56,8 +54,52 @@ if DB_DIR is None:
 LAP_TIMES_DB = os.path.join(DB_DIR, "lap_times.db")
 ELO_DB = os.path.join(DB_DIR, "f1_lap_bot.db")
 
+# Number of laps whose ELO updates are applied together
+BATCH_SIZE = 500
+# Minimum number of seconds between rebuild progress lines
+PROGRESS_INTERVAL = 1.0
+
+# A lap is a PB (TR) when it is strictly faster than every earlier lap by the
+# same driver (any driver) on that track. MIN over an empty frame is NULL,
+# so a driver's (track's) first lap always counts.
+UPDATE_FLAGS_SQL = """
+    UPDATE lap_times
+    SET is_personal_best = flags.is_pb, is_overall_best = flags.is_tr
+    FROM (
+        SELECT rowid AS lap_rowid,
+               COALESCE(total_milliseconds < MIN(total_milliseconds) OVER earlier_own_laps, 1) AS is_pb,
+               COALESCE(total_milliseconds < MIN(total_milliseconds) OVER earlier_track_laps, 1) AS is_tr
+        FROM lap_times
+        WINDOW earlier_own_laps AS (
+                   PARTITION BY user_id, track_key ORDER BY created_at, rowid
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ),
+               earlier_track_laps AS (
+                   PARTITION BY track_key ORDER BY created_at, rowid
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               )
+    ) AS flags
+    WHERE lap_times.rowid = flags.lap_rowid
+"""
+
 
-async def clear_derived_data():
+def ensure_rebuild_indexes(lap_conn):
+    """Create the index the rebuild queries rely on and refresh statistics.
+    
+    (user_id, track_key, created_at) lets the latest-username lookup in
+    finalize_data walk each user's laps in index order instead of scanning
+    the table, and ANALYZE gives the planner current statistics for the
+    windowed PB/TR update.
+    """
+    lap_conn.executescript("""
+        PRAGMA analysis_limit=400;
+        CREATE INDEX IF NOT EXISTS idx_user_track_created
+            ON lap_times(user_id, track_key, created_at);
+        ANALYZE;
+    """)
+
+
+def clear_derived_data(lap_conn, elo_conn):
     """Wipe all calculated data to prepare for a fresh rebuild."""
     print("🔥 Clearing all derived data (ELO, PBs, TRs)...")
     print(f"  📂 Script directory: {SCRIPT_DIR}")
@@ -67,157 +109,150 @@ async def clear_derived_data():
     
     # Database existence is already checked during path discovery
     
-    # Clear ELO ratings
+    # Clear ELO ratings in place; the schema is kept for the rebuild
     try:
-        os.remove(ELO_DB)
-        print("  🗑️ Deleted old ELO database.")
-    except FileNotFoundError:
-        print("  🤷 No old ELO database to delete.")
+        with elo_conn:
+            elo_conn.execute("DELETE FROM driver_ratings")
+        print("  🗑️ Deleted old ELO ratings.")
+    except sqlite3.OperationalError:
+        # No driver_ratings table yet; the rating repository creates it
+        print("  🤷 No old ELO ratings to delete.")
         
     # Reset PB/TR flags in lap_times
-    conn = sqlite3.connect(LAP_TIMES_DB)
-    cursor = conn.cursor()
-    cursor.execute("UPDATE lap_times SET is_personal_best = 0, is_overall_best = 0")
-    conn.commit()
-    conn.close()
+    lap_conn.execute("UPDATE lap_times SET is_personal_best = 0, is_overall_best = 0")
+    lap_conn.commit()
     print("  🚩 Reset all Personal Best and Track Record flags.")
 
 
-async def fix_null_sectors():
+def fix_null_sectors(lap_conn):
     """Fix NULL sectors in the database by setting them to 0."""
     print("\n🛠️ Fixing NULL sectors in database...")
     
-    conn = sqlite3.connect(LAP_TIMES_DB)
-    cursor = conn.cursor()
-    
-    # Count NULL sectors first
-    cursor.execute("SELECT COUNT(*) FROM lap_times WHERE sector1_ms IS NULL OR sector2_ms IS NULL OR sector3_ms IS NULL")
-    null_count = cursor.fetchone()[0]
+    # Only rows with a NULL sector are rewritten; rowcount reports how many
+    with lap_conn:
+        cursor = lap_conn.execute("""
+            UPDATE lap_times
+            SET sector1_ms = COALESCE(sector1_ms, 0),
+                sector2_ms = COALESCE(sector2_ms, 0),
+                sector3_ms = COALESCE(sector3_ms, 0)
+            WHERE sector1_ms IS NULL OR sector2_ms IS NULL OR sector3_ms IS NULL
+        """)
+    null_count = cursor.rowcount
     
     if null_count > 0:
-        print(f"  🔧 Found {null_count} lap times with NULL sectors, fixing...")
-        
-        # Fix NULL sectors by setting them to 0
-        cursor.execute("UPDATE lap_times SET sector1_ms = COALESCE(sector1_ms, 0), sector2_ms = COALESCE(sector2_ms, 0), sector3_ms = COALESCE(sector3_ms, 0)")
-        conn.commit()
-        
         print(f"  ✅ Fixed {null_count} lap times with NULL sectors.")
     else:
         print("  ✅ No NULL sectors found, database is clean.")
-    
-    conn.close()
 
 
-async def rebuild_history():
-    """Re-process all lap times chronologically to fix all stats."""
+def _write_progress(processed, total_laps, lap_entity):
+    """Write a rebuild progress line to stderr."""
+    sys.stderr.write(
+        f"  ⚡ Processed {processed}/{total_laps} laps... "
+        f"(Current: {lap_entity.username} on {lap_entity.track_name.short_name})\n"
+    )
+
+
+async def rebuild_history(lap_conn):
+    """Re-process all lap times chronologically to fix all stats.
+    
+    This is the only async step: the ELO use case and its repositories are
+    async, while the surrounding steps are plain blocking sqlite3 work.
+    """
     print("\n🔄 Starting historical recalculation...")
     
     lap_repo = SQLiteLapTimeRepository(LAP_TIMES_DB)
     elo_repo = SQLiteDriverRatingRepository(ELO_DB)
     update_elo_use_case = UpdateEloRatingsUseCase(elo_repo, lap_repo)
 
-    # Load all lap times, sorted from oldest to newest
-    conn = sqlite3.connect(LAP_TIMES_DB)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM lap_times ORDER BY created_at ASC")
-    all_laps_rows = cursor.fetchall()
-    conn.close()
+    # --- 1. Recalculate Personal Bests and Track Records in SQLite ---
+    with lap_conn:
+        lap_conn.execute(UPDATE_FLAGS_SQL)
+    print("  🚩 Recalculated all Personal Best and Track Record flags.")
 
-    total_laps = len(all_laps_rows)
+    total_laps = lap_conn.execute("SELECT COUNT(*) FROM lap_times").fetchone()[0]
     print(f"  📂 Found {total_laps} lap times to process.")
 
-    # In-memory tracking for current bests
-    personal_bests = {}
-    track_records = {}
+    # ELO updates are buffered and applied in batches
+    pending_laps = []
+    next_progress = time.monotonic() + PROGRESS_INTERVAL
 
+    # Stream all lap times from oldest to newest instead of loading them at once
+    all_laps_rows = lap_conn.execute("SELECT * FROM lap_times ORDER BY created_at ASC, rowid")
     for i, row in enumerate(all_laps_rows):
-        # Convert row to LapTime entity
+        # --- 2. Queue the ELO update ---
         lap_entity = lap_repo._row_to_lap_time(row)
-        
-        # --- 1. Recalculate Personal Best ---
-        pb_key = (lap_entity.user_id, lap_entity.track_name.key)
-        is_pb = False
-        if pb_key not in personal_bests or lap_entity.time_format.total_milliseconds < personal_bests[pb_key]:
-            is_pb = True
-            personal_bests[pb_key] = lap_entity.time_format.total_milliseconds
-
-        # --- 2. Recalculate Track Record ---
-        tr_key = lap_entity.track_name.key
-        is_tr = False
-        if tr_key not in track_records or lap_entity.time_format.total_milliseconds < track_records[tr_key]:
-            is_tr = True
-            track_records[tr_key] = lap_entity.time_format.total_milliseconds
-
-        # --- 3. Update the Lap Record in DB ---
-        conn = sqlite3.connect(LAP_TIMES_DB)
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE lap_times SET is_personal_best = ?, is_overall_best = ? WHERE lap_id = ?",
-            (is_pb, is_tr, lap_entity.lap_id)
-        )
-        conn.commit()
-        conn.close()
-        
-        # --- 4. Update ELO based on this lap ---
-        await update_elo_use_case.execute(lap_entity)
-
-        if (i + 1) % 10 == 0 or (i + 1) == total_laps:
-            print(f"  ⚡ Processed {i+1}/{total_laps} laps... (Current: {lap_entity.username} on {lap_entity.track_name.short_name})")
+        pending_laps.append(lap_entity)
 
+        # --- 3. Apply the queued updates, oldest lap first ---
+        if len(pending_laps) >= BATCH_SIZE:
+            await update_elo_use_case.execute_batch(pending_laps)
+            pending_laps.clear()
+        
+        # Progress goes to stderr at most once per PROGRESS_INTERVAL; the
+        # clock is checked for every lap, not only when a batch is applied
+        if time.monotonic() >= next_progress:
+            _write_progress(i + 1, total_laps, lap_entity)
+            next_progress = time.monotonic() + PROGRESS_INTERVAL
+    
+    if pending_laps:
+        await update_elo_use_case.execute_batch(pending_laps)
+    if total_laps:
+        _write_progress(i + 1, total_laps, lap_entity)
+    
+    await lap_repo.close()
     print("\n✅ Historical data rebuild complete!")
 
 
-async def finalize_data():
+def finalize_data(lap_conn, elo_conn):
     """Update usernames and show final summary."""
     print("\n🎨 Finalizing data and updating usernames...")
     
-    # Get all unique users and their latest names
-    conn = sqlite3.connect(LAP_TIMES_DB)
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT user_id FROM lap_times")
-    user_ids = [row[0] for row in cursor.fetchall()]
-    conn.close()
-
-    elo_conn = sqlite3.connect(ELO_DB)
-    elo_cursor = elo_conn.cursor()
-
-    for user_id in user_ids:
-        # Get latest username from lap_times db
-        laps_conn = sqlite3.connect(LAP_TIMES_DB)
-        laps_cursor = laps_conn.cursor()
-        laps_cursor.execute("SELECT username FROM lap_times WHERE user_id = ? ORDER BY created_at DESC LIMIT 1", (user_id,))
-        latest_username = laps_cursor.fetchone()[0]
-        laps_conn.close()
-
-        # Update the username in the ELO database
-        elo_cursor.execute("UPDATE driver_ratings SET username = ? WHERE user_id = ?", (latest_username, user_id))
-    
-    elo_conn.commit()
-    elo_conn.close()
+    # Get every user's latest name in one query; SQLite returns the bare
+    # username column from the row holding MAX(created_at)
+    latest_usernames = lap_conn.execute("""
+        SELECT username, user_id, MAX(created_at)
+        FROM lap_times
+        GROUP BY user_id
+    """).fetchall()
+
+    # Update the usernames in the ELO database in one transaction
+    with elo_conn:
+        elo_conn.executemany(
+            "UPDATE driver_ratings SET username = ? WHERE user_id = ?",
+            [(username, user_id) for username, user_id, _ in latest_usernames]
+        )
     print("  ✨ Usernames synced to latest versions.")
 
     # --- Final Summary ---
     print("\n🏆 Final ELO Leaderboard:")
-    elo_conn = sqlite3.connect(ELO_DB)
-    elo_conn.row_factory = sqlite3.Row
     elo_cursor = elo_conn.cursor()
     elo_cursor.execute("SELECT * FROM driver_ratings ORDER BY current_elo DESC")
     final_ratings = elo_cursor.fetchall()
-    elo_conn.close()
     
     for i, rating in enumerate(final_ratings):
         print(f"  {i+1}. {rating['username']}: {rating['current_elo']} ELO ({rating['wins']}W/{rating['losses']}L)")
+    
+    # Fold the WAL back into the database files so they are self-contained
+    for conn in (lap_conn, elo_conn):
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
 
-async def main():
-    await clear_derived_data()
-    await fix_null_sectors()  # NEW: Fix NULL sectors before rebuilding
-    await rebuild_history()
-    await finalize_data()
+def main():
+    # One connection per database serves the whole rebuild
+    lap_conn = connect(LAP_TIMES_DB, row_factory=sqlite3.Row)
+    elo_conn = connect(ELO_DB, row_factory=sqlite3.Row)
+    try:
+        ensure_rebuild_indexes(lap_conn)
+        clear_derived_data(lap_conn, elo_conn)
+        fix_null_sectors(lap_conn)  # NEW: Fix NULL sectors before rebuilding
+        asyncio.run(rebuild_history(lap_conn))
+        finalize_data(lap_conn, elo_conn)
+    finally:
+        lap_conn.close()
+        elo_conn.close()
     print("\n🎉 All stats have been successfully rebuilt from scratch!")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
-
+    main()
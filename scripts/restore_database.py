@@ -15,9 +15,14 @@ Run this before rebuild_and_recalculate.py to fix database issues.
 import sqlite3
 import os
 import sys
-import shutil
+import uuid
 from datetime import datetime
 
+# The parent directory is the project root when the script is run from scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.persistence.sqlite_tuning import connect as _connect
+
 def find_database_path():
     """Find the correct database path."""
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -33,24 +38,50 @@ def find_database_path():
     # Return project root path as default (will be created)
     return possible_paths[0]
 
+# Side files of a WAL-mode database; recent commits may live only in -wal
+WAL_SUFFIXES = ("-wal", "-shm")
+
 def backup_existing_database(db_path):
-    """Create a backup of the existing database."""
+    """Create a backup of the existing database.
+    
+    Uses SQLite's online backup so laps still held in the -wal file are
+    included; a plain copy of the main file would miss them.
+    """
     if os.path.exists(db_path):
         backup_path = f"{db_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        shutil.copy2(db_path, backup_path)
+        source = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        backup = sqlite3.connect(backup_path)
+        try:
+            source.backup(backup)
+        finally:
+            backup.close()
+            source.close()
         print(f"  📋 Created backup: {backup_path}")
         return backup_path
     return None
 
+# Column order shared by extract_lap_data and insert_lap_data
+LAP_COLUMNS = (
+    "lap_id", "user_id", "username", "track_key",
+    "time_minutes", "time_seconds", "time_milliseconds", "total_milliseconds",
+    "is_personal_best", "is_overall_best", "is_bot",
+    "sector1_ms", "sector2_ms", "sector3_ms", "created_at",
+)
+
 def extract_lap_data(db_path):
-    """Extract all lap time data from existing database."""
+    """Extract all lap time data from existing database.
+    
+    Returns plain tuples in LAP_COLUMNS order. Columns missing from an older
+    schema are selected as NULL so every row has the same shape.
+    """
     if not os.path.exists(db_path):
         print(f"  ⚠️  No existing database found at {db_path}")
         return []
     
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        # Read-only and untuned: the source must not be switched to WAL or
+        # left with -wal/-shm files next to it before it is replaced
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
         cursor = conn.cursor()
         
         # Check if table exists
@@ -61,12 +92,18 @@ def extract_lap_data(db_path):
             return []
         
         # Extract all data
-        cursor.execute("SELECT * FROM lap_times ORDER BY created_at ASC")
+        cursor.execute("PRAGMA table_info(lap_times)")
+        existing_columns = {row[1] for row in cursor.fetchall()}
+        select_list = ", ".join(
+            column if column in existing_columns else f"NULL AS {column}"
+            for column in LAP_COLUMNS
+        )
+        cursor.execute(f"SELECT {select_list} FROM lap_times ORDER BY created_at ASC")
         rows = cursor.fetchall()
         conn.close()
         
         print(f"  📂 Extracted {len(rows)} lap times from existing database")
-        return [dict(row) for row in rows]
+        return rows
         
     except Exception as e:
         print(f"  ❌ Error reading existing database: {e}")
@@ -74,17 +111,20 @@ def extract_lap_data(db_path):
 
 def create_clean_database(db_path):
     """Create a new, clean database with proper structure."""
-    # Remove old database
+    # Remove old database, including its WAL side files so the new database
+    # does not pick up a stale log
     if os.path.exists(db_path):
         os.remove(db_path)
         print(f"  🗑️ Removed old database")
+    for suffix in WAL_SUFFIXES:
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
     
     # Create new database
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    conn = _connect(db_path)
     
     # Create table with proper structure
-    cursor.execute("""
+    conn.executescript("""
         CREATE TABLE lap_times (
             lap_id TEXT PRIMARY KEY,
             user_id TEXT NOT NULL,
@@ -101,116 +141,105 @@ def create_clean_database(db_path):
             sector2_ms INTEGER DEFAULT 0,
             sector3_ms INTEGER DEFAULT 0,
             created_at TEXT NOT NULL
-        )
+        );
     """)
     
-    # Create indexes for performance
-    cursor.execute("CREATE INDEX idx_track_time ON lap_times(track_key, total_milliseconds)")
-    cursor.execute("CREATE INDEX idx_user_track ON lap_times(user_id, track_key)")
-    cursor.execute("CREATE INDEX idx_created_at ON lap_times(created_at DESC)")
-    
-    conn.commit()
     conn.close()
     print(f"  ✅ Created clean database with proper structure")
 
-def insert_lap_data(db_path, lap_data):
+def create_indexes(conn):
+    """Create indexes and refresh statistics once the data is loaded.
+    
+    Building each index in one pass after the bulk insert is cheaper than
+    maintaining it row by row during the insert.
+    """
+    conn.executescript("""
+        CREATE INDEX idx_track_time ON lap_times(track_key, total_milliseconds);
+        CREATE INDEX idx_user_track ON lap_times(user_id, track_key);
+        CREATE INDEX idx_created_at ON lap_times(created_at DESC);
+        ANALYZE;
+        VACUUM;
+    """)
+    print(f"  ✅ Created indexes and refreshed query statistics")
+
+INSERT_LAP_SQL = f"""
+    INSERT INTO lap_times ({", ".join(LAP_COLUMNS)})
+    VALUES ({", ".join("?" * len(LAP_COLUMNS))})
+"""
+
+def normalize_lap_row(lap, now_iso):
+    """Fill in defaults for the missing fields of one LAP_COLUMNS row.
+    
+    Text fields only fall back when NULL, so empty strings are kept.
+    """
+    (lap_id, user_id, username, track_key,
+     time_minutes, time_seconds, time_milliseconds, total_milliseconds,
+     is_personal_best, is_overall_best, is_bot,
+     sector1_ms, sector2_ms, sector3_ms, created_at) = lap
+    return (
+        lap_id or str(uuid.uuid4()),
+        user_id if user_id is not None else 'unknown',
+        username if username is not None else 'Unknown User',
+        track_key if track_key is not None else 'unknown',
+        time_minutes or 0, time_seconds or 0, time_milliseconds or 0,
+        total_milliseconds or 0,
+        is_personal_best or 0, is_overall_best or 0, is_bot or 0,
+        sector1_ms or 0, sector2_ms or 0, sector3_ms or 0,
+        created_at or now_iso,
+    )
+
+def insert_lap_data(conn, lap_data):
     """Insert lap data into the clean database."""
     if not lap_data:
         print("  ⚠️  No data to insert")
         return
     
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    # Fix NULL sectors (sector1_ms..sector3_ms are LAP_COLUMNS[11:14])
+    fixed_sectors_count = sum(1 for row in lap_data if None in row[11:14])
     
-    inserted_count = 0
-    fixed_sectors_count = 0
+    # Generate lap_id if missing and ensure required fields exist; rows
+    # that still fail to insert are skipped by the row-by-row fallback
+    now_iso = datetime.now().isoformat()
+    rows = [normalize_lap_row(lap, now_iso) for lap in lap_data]
     
-    for lap in lap_data:
-        try:
-            # Fix NULL sectors
-            sector1_ms = lap.get('sector1_ms') or 0
-            sector2_ms = lap.get('sector2_ms') or 0  
-            sector3_ms = lap.get('sector3_ms') or 0
-            
-            if lap.get('sector1_ms') is None or lap.get('sector2_ms') is None or lap.get('sector3_ms') is None:
-                fixed_sectors_count += 1
-            
-            # Generate lap_id if missing
-            lap_id = lap.get('lap_id')
-            if not lap_id:
-                import uuid
-                lap_id = str(uuid.uuid4())
-            
-            # Ensure required fields exist
-            user_id = lap.get('user_id', 'unknown')
-            username = lap.get('username', 'Unknown User')
-            track_key = lap.get('track_key', 'unknown')
-            
-            # Time components
-            time_minutes = lap.get('time_minutes', 0)
-            time_seconds = lap.get('time_seconds', 0)
-            time_milliseconds = lap.get('time_milliseconds', 0)
-            total_milliseconds = lap.get('total_milliseconds', 0)
-            
-            # Flags
-            is_personal_best = lap.get('is_personal_best', 0)
-            is_overall_best = lap.get('is_overall_best', 0)
-            is_bot = lap.get('is_bot', 0)
-            
-            # Created at
-            created_at = lap.get('created_at')
-            if not created_at:
-                created_at = datetime.now().isoformat()
-            
-            cursor.execute("""
-                INSERT INTO lap_times (
-                    lap_id, user_id, username, track_key,
-                    time_minutes, time_seconds, time_milliseconds, total_milliseconds,
-                    is_personal_best, is_overall_best, is_bot,
-                    sector1_ms, sector2_ms, sector3_ms, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                lap_id, user_id, username, track_key,
-                time_minutes, time_seconds, time_milliseconds, total_milliseconds,
-                is_personal_best, is_overall_best, is_bot,
-                sector1_ms, sector2_ms, sector3_ms, created_at
-            ))
-            
-            inserted_count += 1
-            
-        except Exception as e:
-            print(f"  ⚠️  Error inserting lap {lap.get('lap_id', 'unknown')}: {e}")
-            continue
-    
-    conn.commit()
-    conn.close()
+    try:
+        # All rows go in through one prepared statement and one transaction;
+        # the connection context commits on success and rolls back on error
+        with conn:
+            conn.executemany(INSERT_LAP_SQL, rows)
+        inserted_count = len(rows)
+    except Exception as e:
+        # Fall back to row-by-row inserts so a single bad lap is skipped
+        # instead of losing the whole batch
+        print(f"  ⚠️  Batch insert failed ({e}), retrying row by row...")
+        inserted_count = 0
+        with conn:
+            for row in rows:
+                try:
+                    conn.execute(INSERT_LAP_SQL, row)
+                    inserted_count += 1
+                except Exception as row_error:
+                    print(f"  ⚠️  Error inserting lap {row[0]}: {row_error}")
     
     print(f"  ✅ Inserted {inserted_count} lap times")
     if fixed_sectors_count > 0:
         print(f"  🔧 Fixed {fixed_sectors_count} lap times with NULL sectors")
 
-def verify_database(db_path):
+def verify_database(conn):
     """Verify the restored database."""
-    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
-    # Count total records
-    cursor.execute("SELECT COUNT(*) FROM lap_times")
-    total_count = cursor.fetchone()[0]
-    
-    # Count NULL sectors (should be 0 now)
-    cursor.execute("SELECT COUNT(*) FROM lap_times WHERE sector1_ms IS NULL OR sector2_ms IS NULL OR sector3_ms IS NULL")
-    null_sectors = cursor.fetchone()[0]
-    
-    # Count unique users
-    cursor.execute("SELECT COUNT(DISTINCT user_id) FROM lap_times")
-    unique_users = cursor.fetchone()[0]
-    
-    # Count unique tracks
-    cursor.execute("SELECT COUNT(DISTINCT track_key) FROM lap_times")
-    unique_tracks = cursor.fetchone()[0]
-    
-    conn.close()
+    # Gather all counters in a single scan
+    cursor.execute("""
+        SELECT COUNT(*),
+               SUM(CASE WHEN sector1_ms IS NULL OR sector2_ms IS NULL OR sector3_ms IS NULL
+                        THEN 1 ELSE 0 END),
+               COUNT(DISTINCT user_id),
+               COUNT(DISTINCT track_key)
+        FROM lap_times
+    """)
+    total_count, null_sectors, unique_users, unique_tracks = cursor.fetchone()
+    null_sectors = null_sectors or 0  # SUM over an empty table is NULL
     
     print(f"\n📊 Database Verification:")
     print(f"  Total lap times: {total_count}")
@@ -238,13 +267,24 @@ def main():
     print("\n🏗️ Creating clean database...")
     create_clean_database(db_path)
     
-    # Insert data
-    print("\n📥 Inserting lap time data...")
-    insert_lap_data(db_path, lap_data)
+    # One tuned connection serves the whole write/verify pipeline
+    conn = _connect(db_path)
+    try:
+        # Insert data
+        print("\n📥 Inserting lap time data...")
+        insert_lap_data(conn, lap_data)
+        
+        # Build indexes after the bulk load
+        print("\n🗂️ Creating indexes...")
+        create_indexes(conn)
+        
+        # Verify database
+        print("\n🔍 Verifying restored database...")
+        verified = verify_database(conn)
+    finally:
+        conn.close()
     
-    # Verify database
-    print("\n🔍 Verifying restored database...")
-    if verify_database(db_path):
+    if verified:
         print("\n✅ Database restoration completed successfully!")
         print("\nNext steps:")
         print("1. Run: python3 rebuild_and_recalculate.py")
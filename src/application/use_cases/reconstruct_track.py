@@ -11,7 +11,8 @@ This follows Clean Architecture by coordinating domain services and repositories
 without containing business logic itself.
 """
 
-from typing import List
+from collections import OrderedDict
+from typing import List, Tuple
 from ...domain.interfaces.telemetry_repository import ITelemetryRepository
 from ...domain.services.track_reconstructor import TrackReconstructor
 from ...domain.entities.track_profile import TrackProfile
@@ -19,6 +20,9 @@ from ...domain.entities.lap_trace import LapTrace
 from ...domain.value_objects.telemetry_sample import TelemetrySample
 from ..exceptions import SessionNotFoundError, InsufficientDataError, InvalidTrackDataError
 
+# Number of reconstructed track profiles kept for reuse
+PROFILE_CACHE_SIZE = 16
+
 
 class ReconstructTrackUseCase:
     """Application service for reconstructing track geometry from telemetry.
@@ -66,6 +70,7 @@ class ReconstructTrackUseCase:
         """
         self._telemetry_repository = telemetry_repository
         self._track_reconstructor = track_reconstructor
+        self._profile_cache: "OrderedDict[Tuple, TrackProfile]" = OrderedDict()
     
     async def execute(
         self,
@@ -143,6 +148,13 @@ class ReconstructTrackUseCase:
                 data_type="laps"
             )
         
+        # Reuse the profile if exactly these laps were reconstructed before
+        cache_key = self._profile_cache_key(session_uid, track_id, lap_traces)
+        cached_profile = self._profile_cache.get(cache_key)
+        if cached_profile is not None:
+            self._profile_cache.move_to_end(cache_key)
+            return cached_profile
+        
         # Step 4: Aggregate telemetry samples from all valid laps
         all_samples: List[TelemetrySample] = []
         
@@ -199,4 +211,36 @@ class ReconstructTrackUseCase:
             track_length_m=float(distances[-1])  # Use computed track length from centerline
         )
         
+        self._profile_cache[cache_key] = track_profile
+        if len(self._profile_cache) > PROFILE_CACHE_SIZE:
+            self._profile_cache.popitem(last=False)
+        
         return track_profile
+    
+    def _profile_cache_key(
+        self,
+        session_uid: str,
+        track_id: str,
+        lap_traces: List[LapTrace]
+    ) -> Tuple:
+        """Build a cache key identifying the input of a reconstruction.
+        
+        Completed laps cannot gain samples, so a lap's trace ID together with
+        its validity, completion and sample count pins down its contribution.
+        
+        Args:
+            session_uid: Session the laps belong to.
+            track_id: Track identifier from the session.
+            lap_traces: Lap traces fetched for the session.
+            
+        Returns:
+            Hashable key for the profile cache.
+        """
+        return (
+            session_uid,
+            track_id,
+            tuple(
+                (lap_trace.trace_id, lap_trace.is_valid, lap_trace.is_complete(), lap_trace.sample_count)
+                for lap_trace in lap_traces
+            )
+        )
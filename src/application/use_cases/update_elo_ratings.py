@@ -1,12 +1,29 @@
 """Use case for updating ELO ratings after lap time submission."""
 
-from typing import List
+import asyncio
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List
+from weakref import WeakKeyDictionary
 from ...domain.entities.lap_time import LapTime
-from ...domain.entities.driver_rating import DriverRating
+from ...domain.entities.driver_rating import (
+    BASE_K_FACTOR,
+    K_TIME_DIFF_THRESHOLDS,
+    K_TIME_MULTIPLIERS,
+    DriverRating,
+)
 from ...domain.interfaces.driver_rating_repository import DriverRatingRepository
 from ...domain.interfaces.lap_time_repository import LapTimeRepository
 from ...domain.value_objects.track_name import TrackName
 
+# Comparison laps older than these ages count for less in a virtual match
+RECENCY_REDUCED_AGE = timedelta(days=30)
+RECENCY_OLD_AGE = timedelta(days=90)
+
+# Every rating update is a read-modify-write of driver_ratings rows, so all
+# use case instances sharing a rating repository take the same lock
+_RATING_LOCKS: "WeakKeyDictionary[DriverRatingRepository, asyncio.Lock]" = WeakKeyDictionary()
+
 
 class UpdateEloRatingsUseCase:
     """Application service for updating ELO ratings based on lap time submissions."""
@@ -18,6 +35,7 @@ class UpdateEloRatingsUseCase:
     ):
         self._driver_rating_repository = driver_rating_repository
         self._lap_time_repository = lap_time_repository
+        self._ratings_lock = _RATING_LOCKS.setdefault(driver_rating_repository, asyncio.Lock())
     
     async def execute(self, submitted_lap: LapTime) -> DriverRating:
         """
@@ -29,6 +47,11 @@ class UpdateEloRatingsUseCase:
         Returns:
             Updated driver rating for the submitting user
         """
+        async with self._ratings_lock:
+            return await self._update_ratings(submitted_lap)
+    
+    async def _update_ratings(self, submitted_lap: LapTime) -> DriverRating:
+        """Apply one lap submission; the caller holds the ratings lock."""
         # Get or create driver rating for the submitting user
         user_rating = await self._driver_rating_repository.find_by_user_id(submitted_lap.user_id)
         if not user_rating:
@@ -48,12 +71,27 @@ class UpdateEloRatingsUseCase:
             await self._driver_rating_repository.save(user_rating)
             return user_rating
         
+        # Get competitors' ratings (or create defaults)
+        competitor_ratings = {}
+        for competitor_lap in track_competitors:
+            competitor_rating = await self._driver_rating_repository.find_by_user_id(
+                competitor_lap.user_id
+            )
+            if not competitor_rating:
+                competitor_rating = DriverRating(
+                    user_id=competitor_lap.user_id,
+                    username=competitor_lap.username
+                )
+            competitor_ratings[competitor_lap.user_id] = competitor_rating
+        
         # Calculate virtual matches and update ELO
-        elo_change, wins, losses = await self._calculate_elo_changes(
+        elo_change, wins, losses = self._calculate_elo_changes(
             submitted_lap, 
             user_rating, 
-            track_competitors
+            track_competitors,
+            competitor_ratings
         )
+        await self._driver_rating_repository.save_all(list(competitor_ratings.values()))
         
         # Update the user's rating
         user_rating.update_after_matches(elo_change, wins, losses)
@@ -61,46 +99,123 @@ class UpdateEloRatingsUseCase:
         
         return user_rating
     
+    async def execute_batch(self, submitted_laps: List[LapTime]) -> List[DriverRating]:
+        """
+        Update ELO ratings for several lap submissions, oldest first.
+        
+        Produces the same ratings as calling execute() for each lap in order,
+        but loads the affected ratings and each track's competitors once and
+        writes the submitters' and their opponents' ratings back in a single
+        save_all() call. The lap times themselves must not change while the
+        batch is processed.
+        
+        Args:
+            submitted_laps: Lap times in the order they were submitted
+            
+        Returns:
+            Updated driver ratings for the submitting users
+        """
+        async with self._ratings_lock:
+            return await self._update_ratings_batch(submitted_laps)
+    
+    async def _update_ratings_batch(self, submitted_laps: List[LapTime]) -> List[DriverRating]:
+        """Apply several lap submissions; the caller holds the ratings lock."""
+        # Load every track's best time per user once for the whole batch
+        track_best_times: Dict[str, Dict[str, LapTime]] = {}
+        for lap in submitted_laps:
+            track_key = lap.track_name.key
+            if track_key not in track_best_times:
+                track_best_times[track_key] = await self._get_best_times_by_user(lap.track_name)
+        
+        # Load every rating the batch can touch in one query
+        user_ids = {lap.user_id for lap in submitted_laps}
+        for best_times in track_best_times.values():
+            user_ids.update(best_times)
+        ratings: Dict[str, DriverRating] = {
+            rating.user_id: rating
+            for rating in await self._driver_rating_repository.find_by_user_ids(list(user_ids))
+        }
+        
+        def get_rating(user_id: str, username: str) -> DriverRating:
+            rating = ratings.get(user_id)
+            if rating is None:
+                rating = ratings[user_id] = DriverRating(user_id=user_id, username=username)
+            return rating
+        
+        updated_ratings = []
+        # Only ratings the batch actually rated are written back
+        changed_ratings: Dict[str, DriverRating] = {}
+        for submitted_lap in submitted_laps:
+            user_rating = get_rating(submitted_lap.user_id, submitted_lap.username)
+            changed_ratings[user_rating.user_id] = user_rating
+            track_competitors = [
+                lap_time
+                for user_id, lap_time in track_best_times[submitted_lap.track_name.key].items()
+                if user_id != submitted_lap.user_id
+            ]
+            
+            if track_competitors:
+                competitor_ratings = {
+                    competitor_lap.user_id: get_rating(competitor_lap.user_id, competitor_lap.username)
+                    for competitor_lap in track_competitors
+                }
+                elo_change, wins, losses = self._calculate_elo_changes(
+                    submitted_lap,
+                    user_rating,
+                    track_competitors,
+                    competitor_ratings
+                )
+                user_rating.update_after_matches(elo_change, wins, losses)
+                changed_ratings.update(competitor_ratings)
+            
+            updated_ratings.append(user_rating)
+        
+        await self._driver_rating_repository.save_all(list(changed_ratings.values()))
+        return updated_ratings
+    
     async def _get_track_competitors(self, track: TrackName, exclude_user_id: str) -> List[LapTime]:
         """Get all other drivers' best times on the specified track."""
+        user_best_times = await self._get_best_times_by_user(track)
+        user_best_times.pop(exclude_user_id, None)
+        return list(user_best_times.values())
+    
+    async def _get_best_times_by_user(self, track: TrackName) -> Dict[str, LapTime]:
+        """Get each driver's best time among the top times on the specified track."""
         all_track_times = await self._lap_time_repository.find_top_by_track(track, limit=100)
         
         # Group by user and get each user's best time
         user_best_times = {}
         for lap_time in all_track_times:
-            if lap_time.user_id != exclude_user_id:
-                if (lap_time.user_id not in user_best_times or 
-                    lap_time.is_faster_than(user_best_times[lap_time.user_id])):
-                    user_best_times[lap_time.user_id] = lap_time
+            if (lap_time.user_id not in user_best_times or 
+                lap_time.is_faster_than(user_best_times[lap_time.user_id])):
+                user_best_times[lap_time.user_id] = lap_time
         
-        return list(user_best_times.values())
+        return user_best_times
     
-    async def _calculate_elo_changes(
+    def _calculate_elo_changes(
         self, 
         submitted_lap: LapTime, 
         user_rating: DriverRating, 
-        competitors: List[LapTime]
+        competitors: List[LapTime],
+        competitor_ratings: Dict[str, DriverRating]
     ) -> tuple[float, int, int]:
         """
         Calculate ELO changes based on virtual matches against competitors.
         
+        Competitors' ratings in competitor_ratings are updated in place;
+        persisting them is left to the caller.
+        
         Returns:
             Tuple of (total_elo_change, wins, losses)
         """
         total_elo_change = 0.0
         wins = 0
         losses = 0
+        # One reference time for every match of this submission
+        now = datetime.utcnow()
         
         for competitor_lap in competitors:
-            # Get competitor's rating (or create default)
-            competitor_rating = await self._driver_rating_repository.find_by_user_id(
-                competitor_lap.user_id
-            )
-            if not competitor_rating:
-                competitor_rating = DriverRating(
-                    user_id=competitor_lap.user_id,
-                    username=competitor_lap.username
-                )
+            competitor_rating = competitor_ratings[competitor_lap.user_id]
             
             # Calculate expected score
             expected_score = user_rating.calculate_expected_score(competitor_rating.current_elo)
@@ -111,7 +226,7 @@ class UpdateEloRatingsUseCase:
             
             # Calculate K-factor based on time difference and recency
             time_diff = abs(submitted_lap.get_time_difference_to(competitor_lap))
-            recency_weight = self._calculate_recency_weight(competitor_lap.created_at)
+            recency_weight = self._calculate_recency_weight(competitor_lap.created_at, now)
             k_factor = self._calculate_adaptive_k_factor(time_diff, recency_weight)
             
             # Calculate ELO change for this match
@@ -131,7 +246,6 @@ class UpdateEloRatingsUseCase:
                 0 if user_wins else 1, 
                 1 if user_wins else 0
             )
-            await self._driver_rating_repository.save(competitor_rating)
         
         # Return average ELO change if there were matches
         if len(competitors) > 0:
@@ -139,17 +253,14 @@ class UpdateEloRatingsUseCase:
         
         return total_elo_change, wins, losses
     
-    def _calculate_recency_weight(self, lap_time_created_at) -> float:
+    def _calculate_recency_weight(self, lap_time_created_at: datetime, now: datetime) -> float:
         """Calculate weight based on how recent the comparison lap time is."""
-        from datetime import datetime, timedelta
-        
-        now = datetime.utcnow()
         age = now - lap_time_created_at
         
         # Times older than 90 days get reduced weight
-        if age > timedelta(days=90):
+        if age > RECENCY_OLD_AGE:
             return 0.5
-        elif age > timedelta(days=30):
+        elif age > RECENCY_REDUCED_AGE:
             return 0.8
         else:
             return 1.0
@@ -162,16 +273,5 @@ class UpdateEloRatingsUseCase:
             time_difference: Time difference in seconds between lap times
             recency_weight: Weight factor based on age of comparison time
         """
-        base_k = 32
-        
-        # Adjust based on time difference - closer times are more significant
-        if time_difference < 0.1:      # Very close (within 0.1s)
-            time_multiplier = 1.5
-        elif time_difference < 0.5:    # Close (within 0.5s)
-            time_multiplier = 1.2
-        elif time_difference < 2.0:    # Moderate (within 2s)
-            time_multiplier = 1.0
-        else:                          # Large difference (>2s)
-            time_multiplier = 0.7
-        
-        return base_k * time_multiplier * recency_weight
+        time_multiplier = K_TIME_MULTIPLIERS[bisect_right(K_TIME_DIFF_THRESHOLDS, time_difference)]
+        return BASE_K_FACTOR * time_multiplier * recency_weight
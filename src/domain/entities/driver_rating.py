@@ -1,11 +1,56 @@
 """Domain entity representing a driver's ELO rating for time trial performance."""
+import math
+from bisect import bisect_right
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
+# 10 ** (diff / 400) == exp(diff * ln(10) / 400)
+_LN10_OVER_400 = math.log(10.0) / 400.0
+
+# SKILL_LEVELS[i] applies from SKILL_THRESHOLDS[i - 1] up to SKILL_THRESHOLDS[i]
+SKILL_THRESHOLDS = (1200, 1400, 1600, 1800, 2000, 2200)
+SKILL_LEVELS = (
+    "Beginner",
+    "Novice",
+    "Intermediate",
+    "Advanced",
+    "Expert",
+    "Master",
+    "Legendary",
+)
+
+# Closer lap times make a virtual match more significant:
+# K_TIME_MULTIPLIERS[i] applies below K_TIME_DIFF_THRESHOLDS[i] seconds
+BASE_K_FACTOR = 32
+K_TIME_DIFF_THRESHOLDS = (0.1, 0.5, 2.0)  # Very close, close, moderate
+K_TIME_MULTIPLIERS = (1.5, 1.2, 1.0, 0.7)
+
+
+@lru_cache(maxsize=4096)
+def _expected_score(elo_difference: int) -> float:
+    """Expected score for an opponent rated elo_difference points higher.
+    
+    Ratings are whole numbers within a few thousand points of each other,
+    so the set of differences is small and every result is cached.
+    """
+    return 1.0 / (1.0 + math.exp(elo_difference * _LN10_OVER_400))
+
 
 class DriverRating:
     """Rich domain entity for driver ELO ratings with time trial specific logic."""
     
+    __slots__ = (
+        '_user_id',
+        '_username',
+        '_current_elo',
+        '_peak_elo',
+        '_matches_played',
+        '_wins',
+        '_losses',
+        '_last_updated',
+    )
+    
     def __init__(
         self,
         user_id: str,
@@ -68,20 +113,7 @@ class DriverRating:
     @property
     def skill_level(self) -> str:
         """Determine skill level based on ELO rating."""
-        if self._current_elo >= 2200:
-            return "Legendary"
-        elif self._current_elo >= 2000:
-            return "Master"
-        elif self._current_elo >= 1800:
-            return "Expert"
-        elif self._current_elo >= 1600:
-            return "Advanced"
-        elif self._current_elo >= 1400:
-            return "Intermediate"
-        elif self._current_elo >= 1200:
-            return "Novice"
-        else:
-            return "Beginner"
+        return SKILL_LEVELS[bisect_right(SKILL_THRESHOLDS, self._current_elo)]
     
     def update_after_matches(self, elo_change: float, wins_added: int, losses_added: int):
         """Update rating after virtual matches."""
@@ -97,7 +129,7 @@ class DriverRating:
     
     def calculate_expected_score(self, opponent_elo: int) -> float:
         """Calculate expected score against opponent using ELO formula."""
-        return 1.0 / (1.0 + 10.0 ** ((opponent_elo - self._current_elo) / 400.0))
+        return _expected_score(opponent_elo - self._current_elo)
     
     def get_elo_trend(self, days: int = 7) -> int:
         """Get ELO trend over specified days (placeholder for future implementation)."""
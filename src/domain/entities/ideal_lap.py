@@ -230,36 +230,44 @@ class IdealLap:
         if not actual_lap_samples:
             raise ValueError("actual_lap_samples cannot be empty")
         
-        total_loss = 0.0
+        # Gather the samples into arrays once and evaluate every sample in a
+        # single vectorized pass instead of interpolating one at a time
+        sample_count = len(actual_lap_samples)
+        sample_distances = np.fromiter(
+            (sample.lap_distance for sample in actual_lap_samples),
+            dtype=np.float64, count=sample_count
+        )
+        sample_speeds = np.fromiter(
+            (sample.speed for sample in actual_lap_samples),
+            dtype=np.float64, count=sample_count
+        ) / 3.6  # Convert km/h to m/s
         
-        for i, sample in enumerate(actual_lap_samples):
-            # Get sample distance and speed
-            sample_distance = sample.lap_distance
-            sample_speed = sample.speed / 3.6  # Convert km/h to m/s
-            
-            # Skip if distance is outside valid range
-            if sample_distance < self.distance[0] or sample_distance > self.distance[-1]:
-                continue
-            
-            # Calculate instantaneous time loss
-            dt_loss = self.get_time_loss_at(sample_distance, sample_speed)
-            
-            # Estimate distance interval to next sample
-            if i < len(actual_lap_samples) - 1:
-                next_distance = actual_lap_samples[i + 1].lap_distance
-                ds = max(0, next_distance - sample_distance)
-            else:
-                # For last sample, use average spacing
-                if len(actual_lap_samples) > 1:
-                    total_lap_distance = self.distance[-1] - self.distance[0]
-                    ds = total_lap_distance / len(actual_lap_samples)
-                else:
-                    ds = 10.0  # Default 10 meters if only one sample
-            
-            # Accumulate weighted time loss
-            total_loss += dt_loss * ds
+        # Skip samples whose distance is outside valid range
+        in_range = (sample_distances >= self.distance[0]) & (sample_distances <= self.distance[-1])
+        
+        negative_speeds = sample_speeds[in_range & (sample_speeds < 0)]
+        if negative_speeds.size:
+            raise ValueError(
+                f"actual_speed must be non-negative, got {negative_speeds[0]}"
+            )
+        
+        # Instantaneous time loss, zero where either speed is not positive
+        ideal_speeds = np.interp(sample_distances, self.distance, self.ideal_speed)
+        valid = (ideal_speeds > 0) & (sample_speeds > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dt_loss = np.where(valid, 1.0 / sample_speeds - 1.0 / ideal_speeds, 0.0)
+        
+        # Distance interval to next sample; the last sample uses the average
+        # spacing (or 10 meters if it is the only sample)
+        ds = np.empty(sample_count)
+        ds[:-1] = np.maximum(0, np.diff(sample_distances))
+        if sample_count > 1:
+            ds[-1] = (self.distance[-1] - self.distance[0]) / sample_count
+        else:
+            ds[-1] = 10.0
         
-        return total_loss
+        # Accumulate weighted time loss in sample order
+        return sum((dt_loss * ds)[in_range].tolist(), 0.0)
     
     def get_sample_count(self) -> int:
         """Get number of distance points in ideal lap profile.
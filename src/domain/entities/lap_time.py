@@ -8,6 +8,20 @@ from ..value_objects.track_name import TrackName
 class LapTime:
     """Rich domain entity for lap times with business rules and validation."""
     
+    __slots__ = (
+        '_lap_id',
+        '_user_id',
+        '_username',
+        '_time_format',
+        '_track_name',
+        '_created_at',
+        '_is_personal_best',
+        '_is_overall_best',
+        '_sector1_ms',
+        '_sector2_ms',
+        '_sector3_ms',
+    )
+    
     def __init__(
         self,
         user_id: str,
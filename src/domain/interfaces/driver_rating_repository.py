@@ -13,16 +13,31 @@ class DriverRatingRepository(ABC):
         """Save or update a driver rating."""
         pass
     
+    @abstractmethod
+    async def save_all(self, driver_ratings: List[DriverRating]) -> None:
+        """Save or update several driver ratings in one transaction."""
+        pass
+    
     @abstractmethod
     async def find_by_user_id(self, user_id: str) -> Optional[DriverRating]:
         """Find driver rating by user ID."""
         pass
     
+    @abstractmethod
+    async def find_by_user_ids(self, user_ids: List[str]) -> List[DriverRating]:
+        """Find the driver ratings that exist for the given user IDs."""
+        pass
+    
     @abstractmethod
     async def find_all_ratings(self) -> List[DriverRating]:
         """Find all driver ratings."""
         pass
     
+    @abstractmethod
+    async def get_rating_statistics(self) -> dict:
+        """Get the number of rated drivers and their average ELO."""
+        pass
+    
     @abstractmethod
     async def find_top_ratings(self, limit: int = 10) -> List[DriverRating]:
         """Find top driver ratings by ELO."""
@@ -11,6 +11,7 @@ The constructor uses a forward-backward algorithm:
 2. Backward pass: Apply braking limits to avoid over-speed in corners
 """
 
+import math
 import numpy as np
 from typing import Dict, Optional
 from ..entities.track_profile import TrackProfile
@@ -199,25 +200,30 @@ class IdealLapConstructor:
         Returns:
             Array of speeds after forward pass (m/s).
         """
-        n = len(distance)
-        v_forward = np.zeros(n)
+        # The recurrence is inherently sequential, so it runs on plain Python
+        # floats: indexing NumPy arrays and calling np.sqrt per element costs
+        # far more than the arithmetic itself.
+        distances = distance.tolist()
+        v_limits = v_max_corner.tolist()
         
         # Start from standstill (or low speed)
-        v_forward[0] = min(10.0, v_max_corner[0])  # Start at 10 m/s or corner limit
+        v = min(10.0, v_limits[0])  # Start at 10 m/s or corner limit
+        v_forward = [v]
         
         a_accel_max = self.params['a_accel_max']
         
-        for i in range(1, n):
-            ds = distance[i] - distance[i-1]
+        for i in range(1, len(distances)):
+            ds = distances[i] - distances[i-1]
             
             # Kinematic equation: v² = v₀² + 2*a*ds
-            v_squared = v_forward[i-1]**2 + 2 * a_accel_max * ds
-            v_accel = np.sqrt(max(0, v_squared))
+            v_squared = v**2 + 2 * a_accel_max * ds
+            v_accel = math.sqrt(max(0, v_squared))
             
             # Limit by cornering speed constraint
-            v_forward[i] = min(v_accel, v_max_corner[i])
+            v = min(v_accel, v_limits[i])
+            v_forward.append(v)
         
-        return v_forward
+        return np.array(v_forward)
     
     def _backward_pass(
         self,
@@ -238,29 +244,30 @@ class IdealLapConstructor:
         Returns:
             Final ideal speed array (m/s).
         """
-        n = len(distance)
-        v_ideal = v_forward.copy()
+        # Sequential recurrence on plain Python floats, as in _forward_pass
+        distances = distance.tolist()
+        v_limits = v_max_corner.tolist()
+        v_ideal = v_forward.tolist()
+        n = len(distances)
         
         # First, ensure last point respects corner limit
-        v_ideal[n-1] = min(v_ideal[n-1], v_max_corner[n-1])
+        v = v_ideal[n-1] = min(v_ideal[n-1], v_limits[n-1])
         
         a_brake_max = self.params['a_brake_max']
         
         # Iterate backward from end to start
         for i in range(n-2, -1, -1):
-            ds = distance[i+1] - distance[i]
+            ds = distances[i+1] - distances[i]
             
             # Kinematic equation for braking: v² = v_next² + 2*a*ds
-            v_squared = v_ideal[i+1]**2 + 2 * a_brake_max * ds
-            v_brake = np.sqrt(max(0, v_squared))
+            v_squared = v**2 + 2 * a_brake_max * ds
+            v_brake = math.sqrt(max(0, v_squared))
             
-            # Take minimum of forward speed and braking-required speed
-            v_ideal[i] = min(v_ideal[i], v_brake)
-            
-            # Also respect cornering limit
-            v_ideal[i] = min(v_ideal[i], v_max_corner[i])
+            # Take minimum of forward speed and braking-required speed,
+            # and also respect cornering limit
+            v = v_ideal[i] = min(v_ideal[i], v_brake, v_limits[i])
         
-        return v_ideal
+        return np.array(v_ideal)
     
     def _compute_inputs(
         self,
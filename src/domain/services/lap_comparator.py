@@ -13,6 +13,7 @@ from enum import Enum
 from ..entities.lap_trace import LapTrace
 from ..entities.ideal_lap import IdealLap
 from ..entities.track_profile import TrackProfile
+from ..value_objects.telemetry_sample import TelemetrySample
 
 
 class ErrorType(Enum):
@@ -25,7 +26,47 @@ class ErrorType(Enum):
     LINE_ERROR = "line_error"
 
 
-@dataclass(frozen=True)
+# Explanation per error type, filled with the time loss in ms and the
+# absolute speed deltas in m/s
+_EXPLANATION_TEMPLATES = {
+    ErrorType.EARLY_BRAKING: (
+        "Early braking cost {loss_ms}ms. Entry {entry:.1f} m/s slower. "
+        "Brake later to carry more speed."
+    ),
+    ErrorType.LATE_BRAKING: (
+        "Late braking cost {loss_ms}ms. Apex {apex:.1f} m/s slower. "
+        "Brake earlier to hit correct apex speed."
+    ),
+    ErrorType.SLOW_CORNER: (
+        "Slow through entire corner, cost {loss_ms}ms. "
+        "Apex {apex:.1f} m/s slower. "
+        "Carry more speed and trust the grip."
+    ),
+    ErrorType.LATE_THROTTLE: (
+        "Late throttle cost {loss_ms}ms. Exit {exit:.1f} m/s slower. "
+        "Apply throttle earlier on corner exit."
+    ),
+    ErrorType.LINE_ERROR: (
+        "Suboptimal line cost {loss_ms}ms. "
+        "Review racing line for this section."
+    ),
+}
+
+
+# Corner error type keyed by which of (entry, apex, exit) were slow
+_CORNER_ERROR_TYPES = {
+    (False, False, False): ErrorType.LINE_ERROR,
+    (False, False, True): ErrorType.LATE_THROTTLE,
+    (False, True, False): ErrorType.LATE_BRAKING,
+    (False, True, True): ErrorType.LATE_BRAKING,
+    (True, False, False): ErrorType.EARLY_BRAKING,
+    (True, False, True): ErrorType.EARLY_BRAKING,
+    (True, True, False): ErrorType.LINE_ERROR,
+    (True, True, True): ErrorType.SLOW_CORNER,
+}
+
+
+@dataclass(frozen=True, slots=True)
 class ComparisonSegment:
     """Value object representing comparison result for a track segment.
     
@@ -123,6 +164,15 @@ class LapComparator:
             num_segments
         )
         
+        # Apexes of all segments in one batched curvature evaluation
+        apex_distances = self._find_apexes(segment_boundaries, track_profile)
+        
+        # Sample distances as one contiguous array, so each segment is a
+        # vectorized range check instead of a scan over sample objects
+        sample_distances = np.fromiter(
+            (s.lap_distance for s in samples), dtype=np.float64, count=len(samples)
+        )
+        
         # Step 2: Analyze each segment
         comparison_segments = []
         for i, (start_dist, end_dist) in enumerate(segment_boundaries):
@@ -130,7 +180,9 @@ class LapComparator:
                 segment_id=i,
                 start_dist=start_dist,
                 end_dist=end_dist,
-                actual_lap=actual_lap,
+                apex_dist=apex_distances[i],
+                samples=samples,
+                sample_distances=sample_distances,
                 ideal_lap=ideal_lap,
                 track_profile=track_profile
             )
@@ -177,7 +229,9 @@ class LapComparator:
         segment_id: int,
         start_dist: float,
         end_dist: float,
-        actual_lap: LapTrace,
+        apex_dist: float,
+        samples: List[TelemetrySample],
+        sample_distances: np.ndarray,
         ideal_lap: IdealLap,
         track_profile: TrackProfile
     ) -> Optional[ComparisonSegment]:
@@ -187,7 +241,9 @@ class LapComparator:
             segment_id: Segment identifier.
             start_dist: Segment start distance (meters).
             end_dist: Segment end distance (meters).
-            actual_lap: Driver's actual lap.
+            apex_dist: Distance of the segment's apex (meters).
+            samples: Telemetry samples of the driver's actual lap.
+            sample_distances: lap_distance of each sample, aligned with samples.
             ideal_lap: Physics-based ideal lap.
             track_profile: Track geometry.
         
@@ -195,11 +251,10 @@ class LapComparator:
             ComparisonSegment if analysis successful, None if insufficient data.
         """
         # Get samples in this segment
-        samples = actual_lap.get_samples()
-        segment_samples = [
-            s for s in samples
-            if start_dist <= s.lap_distance < end_dist
-        ]
+        in_segment = np.flatnonzero(
+            (sample_distances >= start_dist) & (sample_distances < end_dist)
+        )
+        segment_samples = [samples[i] for i in in_segment]
         
         if len(segment_samples) < 3:
             # Not enough data points in segment
@@ -212,9 +267,6 @@ class LapComparator:
             # Driver was faster than ideal (shouldn't happen often)
             time_loss = 0.0
         
-        # Find apex (highest curvature point in segment)
-        apex_dist = self._find_apex(start_dist, end_dist, track_profile)
-        
         # Calculate speed deltas at entry, apex, exit
         entry_sample = segment_samples[0]
         exit_sample = segment_samples[-1]
@@ -277,18 +329,34 @@ class LapComparator:
         Returns:
             Distance of apex point in meters.
         """
-        # Sample curvature at multiple points in segment
-        num_samples = 20
-        distances = np.linspace(start_dist, end_dist, num_samples)
-        curvatures = np.array([
-            abs(track_profile.get_curvature_at(d)) for d in distances
-        ])
+        return self._find_apexes([(start_dist, end_dist)], track_profile)[0]
+    
+    def _find_apexes(
+        self,
+        segment_boundaries: List[tuple[float, float]],
+        track_profile: TrackProfile
+    ) -> np.ndarray:
+        """Find the apex (point of maximum curvature) of every segment at once.
         
-        # Find peak curvature
-        apex_idx = np.argmax(curvatures)
-        apex_dist = distances[apex_idx]
+        Args:
+            segment_boundaries: List of (start_distance, end_distance) tuples.
+            track_profile: Track geometry.
         
-        return apex_dist
+        Returns:
+            Array with the apex distance of each segment in meters.
+        """
+        # Sample curvature at multiple points in each segment: one row of
+        # sample distances per segment, interpolated in a single call
+        num_samples = 20
+        starts, ends = np.array(segment_boundaries, dtype=np.float64).reshape(-1, 2).T
+        distances = np.linspace(starts, ends, num_samples, axis=1)
+        curvatures = np.abs(np.interp(
+            distances, track_profile.distance, track_profile.curvature
+        ))
+        
+        # Find peak curvature per segment
+        apex_idx = np.argmax(curvatures, axis=1)
+        return distances[np.arange(len(distances)), apex_idx]
     
     def _find_closest_sample(self, samples, target_distance):
         """Find telemetry sample closest to target distance."""
@@ -356,28 +424,15 @@ class LapComparator:
                 return ErrorType.LATE_THROTTLE
             return ErrorType.LINE_ERROR
         
-        # Corner analysis
-        if speed_delta_entry < slow_threshold and speed_delta_apex >= slow_threshold:
-            # Slow entry but recovered at apex
-            return ErrorType.EARLY_BRAKING
-        
-        if speed_delta_entry >= slow_threshold and speed_delta_apex < slow_threshold:
-            # Fast entry but slow apex
-            return ErrorType.LATE_BRAKING
-        
-        if speed_delta_apex < slow_threshold and speed_delta_exit < slow_threshold:
-            # Slow through corner
-            if speed_delta_entry < slow_threshold:
-                return ErrorType.SLOW_CORNER
-            else:
-                return ErrorType.LATE_THROTTLE
-        
-        # Check specifically for late throttle (slow exit only)
-        if speed_delta_exit < slow_threshold:
-            return ErrorType.LATE_THROTTLE
-        
-        # Default to line error if pattern unclear
-        return ErrorType.LINE_ERROR
+        # Corner analysis: compare each delta once and look the pattern up.
+        # Slow entry with a recovered apex is early braking, a slow apex after
+        # a normal entry is late braking, slow throughout is a slow corner and
+        # only a slow exit is late throttle; anything else is a line error.
+        return _CORNER_ERROR_TYPES[(
+            speed_delta_entry < slow_threshold,
+            speed_delta_apex < slow_threshold,
+            speed_delta_exit < slow_threshold,
+        )]
     
     def _generate_explanation(
         self,
@@ -399,35 +454,9 @@ class LapComparator:
         Returns:
             String explanation for the driver.
         """
-        time_loss_ms = int(time_loss * 1000)
-        
-        if error_type == ErrorType.EARLY_BRAKING:
-            return (
-                f"Early braking cost {time_loss_ms}ms. Entry {abs(speed_delta_entry):.1f} m/s slower. "
-                f"Brake later to carry more speed."
-            )
-        
-        if error_type == ErrorType.LATE_BRAKING:
-            return (
-                f"Late braking cost {time_loss_ms}ms. Apex {abs(speed_delta_apex):.1f} m/s slower. "
-                f"Brake earlier to hit correct apex speed."
-            )
-        
-        if error_type == ErrorType.SLOW_CORNER:
-            return (
-                f"Slow through entire corner, cost {time_loss_ms}ms. "
-                f"Apex {abs(speed_delta_apex):.1f} m/s slower. "
-                f"Carry more speed and trust the grip."
-            )
-        
-        if error_type == ErrorType.LATE_THROTTLE:
-            return (
-                f"Late throttle cost {time_loss_ms}ms. Exit {abs(speed_delta_exit):.1f} m/s slower. "
-                f"Apply throttle earlier on corner exit."
-            )
-        
-        # LINE_ERROR
-        return (
-            f"Suboptimal line cost {time_loss_ms}ms. "
-            f"Review racing line for this section."
+        return _EXPLANATION_TEMPLATES[error_type].format(
+            loss_ms=int(time_loss * 1000),
+            entry=abs(speed_delta_entry),
+            apex=abs(speed_delta_apex),
+            exit=abs(speed_delta_exit)
         )
@@ -5,11 +5,93 @@ lap comparison data into actionable driving advice for human drivers. Uses
 racing terminology and physics principles to explain where and why time is lost.
 """
 
-from typing import List
+from collections import Counter
+from typing import Iterator, List
 from .lap_comparator import ComparisonSegment, ErrorType
 from ..entities.track_profile import TrackProfile
 
 
+# Per error type: headline, speed detail (deltas in km/h) and tip
+_ERROR_FEEDBACK = {
+    ErrorType.EARLY_BRAKING: (
+        "Braking too early",
+        "Entry speed: {entry:+.1f} km/h vs ideal",
+        "Brake later! Physics allows more grip here.",
+    ),
+    ErrorType.LATE_BRAKING: (
+        "Braking too late",
+        "Apex speed: {apex:+.1f} km/h vs ideal",
+        "Brake earlier to hit the correct apex speed.",
+    ),
+    ErrorType.SLOW_CORNER: (
+        "Slow through entire corner",
+        "Apex speed: {apex:+.1f} km/h vs ideal",
+        "Carry more mid-corner speed. The grip circle allows it.",
+    ),
+    ErrorType.LATE_THROTTLE: (
+        "Throttle application too late",
+        "Exit speed: {exit:+.1f} km/h vs ideal",
+        "Get on throttle earlier on corner exit.",
+    ),
+    ErrorType.LINE_ERROR: (
+        "Suboptimal racing line",
+        "Speed variance: entry {entry:+.1f}, apex {apex:+.1f}, exit {exit:+.1f} km/h",
+        "Review the racing line for this section.",
+    ),
+}
+
+# Overall advice for the most common error type among the top segments
+_SUMMARY_ADVICE = {
+    ErrorType.LATE_THROTTLE: "Focus on corner exits for maximum time gains!",
+    ErrorType.EARLY_BRAKING: "Trust the brakes! You can brake later in most corners.",
+    ErrorType.LATE_BRAKING: "Brake earlier to maintain control through corner apexes.",
+    ErrorType.SLOW_CORNER: "Build confidence to carry more mid-corner speed.",
+    ErrorType.LINE_ERROR: "Review the racing line to find the optimal path.",
+}
+_DEFAULT_SUMMARY_ADVICE = _SUMMARY_ADVICE[ErrorType.LINE_ERROR]
+_NO_SEGMENTS_ADVICE = "Keep up the excellent driving!"
+
+# Keycap emojis for segment ranks; ranks beyond 10 fall back to "N."
+_RANK_EMOJIS = {
+    1: "1️⃣",
+    2: "2️⃣",
+    3: "3️⃣",
+    4: "4️⃣",
+    5: "5️⃣",
+    6: "6️⃣",
+    7: "7️⃣",
+    8: "8️⃣",
+    9: "9️⃣",
+    10: "🔟"
+}
+
+# Heading emojis in emoji mode; plain mode drops them
+_HEADING_EMOJIS = {
+    "analysis": "📊 ",
+    "total": "⏱️ ",
+    "areas": "🎯 ",
+    "advice": "📈 ",
+    "tip": "💡 ",
+    "perfect": "🏆 ",
+    "congrats": "✨ ",
+}
+_NO_HEADING_EMOJIS = dict.fromkeys(_HEADING_EMOJIS, "")
+
+# Segment header with a keycap rank in emoji mode, "N." in plain mode
+_SEGMENT_HEADER = "{rank_emoji} **Segment {segment_id}** ({time_loss:.2f}s loss)"
+_PLAIN_SEGMENT_HEADER = "**{rank}. Segment {segment_id}** ({time_loss:.2f}s loss)"
+
+# Compact-feedback marker for each error type
+_ERROR_EMOJIS = {
+    ErrorType.EARLY_BRAKING: "🛑",
+    ErrorType.LATE_BRAKING: "⚡",
+    ErrorType.SLOW_CORNER: "🐌",
+    ErrorType.LATE_THROTTLE: "🚀",
+    ErrorType.LINE_ERROR: "〰️"
+}
+_NO_ERROR_EMOJIS = dict.fromkeys(ErrorType, "")
+
+
 class MatheCoachFeedbackGenerator:
     """Domain service for generating coaching feedback from lap analysis.
     
@@ -27,6 +109,21 @@ class MatheCoachFeedbackGenerator:
                 Useful for Discord formatting.
         """
         self.use_emojis = use_emojis
+        
+        # Resolve the emoji mode once instead of branching on every line
+        heading_emojis = _HEADING_EMOJIS if use_emojis else _NO_HEADING_EMOJIS
+        self._analysis_prefix = heading_emojis["analysis"]
+        self._total_prefix = heading_emojis["total"]
+        self._areas_heading = f"{heading_emojis['areas']}**Top Improvement Areas:**"
+        self._advice_prefix = f"{heading_emojis['advice']}**Overall advice:**"
+        self._tip_prefix = f"{heading_emojis['tip']}**Tip:**"
+        self._perfect_prefix = heading_emojis["perfect"]
+        self._congrats_line = (
+            f"{heading_emojis['congrats']}Congratulations! Your lap matches the ideal line.\n"
+        )
+        self._segment_header = _SEGMENT_HEADER if use_emojis else _PLAIN_SEGMENT_HEADER
+        self._error_emojis = _ERROR_EMOJIS if use_emojis else _NO_ERROR_EMOJIS
+        self._unknown_error_emoji = "⚠️" if use_emojis else ""
     
     def generate_feedback(
         self,
@@ -64,61 +161,56 @@ class MatheCoachFeedbackGenerator:
         total_loss = sum(seg.time_loss for seg in comparison_segments)
         
         # Build feedback message
-        lines = []
+        return "\n".join(self._feedback_lines(
+            comparison_segments[:top_n], track_profile, track_name, total_loss
+        ))
+    
+    def _feedback_lines(
+        self,
+        segments_to_show: List[ComparisonSegment],
+        track_profile: TrackProfile,
+        track_name: str,
+        total_loss: float
+    ) -> Iterator[str]:
+        """Yield the lines of the full feedback message in order.
+        
+        Args:
+            segments_to_show: Top segments to include, ranked by time loss.
+            track_profile: Track geometry for context.
+            track_name: Human-readable track name.
+            total_loss: Total time lost across all segments, in seconds.
         
+        Yields:
+            Lines of the Markdown feedback message.
+        """
         # Header
-        if self.use_emojis:
-            lines.append(f"📊 **Lap Analysis: {track_name}**")
-        else:
-            lines.append(f"**Lap Analysis: {track_name}**")
-        lines.append("")
+        yield f"{self._analysis_prefix}**Lap Analysis: {track_name}**"
+        yield ""
         
         # Total time loss
-        if self.use_emojis:
-            lines.append(f"⏱️ Total time vs ideal: **+{total_loss:.2f}s**")
-        else:
-            lines.append(f"Total time vs ideal: **+{total_loss:.2f}s**")
-        lines.append("")
+        yield f"{self._total_prefix}Total time vs ideal: **+{total_loss:.2f}s**"
+        yield ""
         
         # Top improvement areas
-        if self.use_emojis:
-            lines.append("🎯 **Top Improvement Areas:**")
-        else:
-            lines.append("**Top Improvement Areas:**")
-        lines.append("")
+        yield self._areas_heading
+        yield ""
         
         # Add feedback for top N segments
-        segments_to_show = comparison_segments[:top_n]
         for i, segment in enumerate(segments_to_show, 1):
-            segment_feedback = self._format_segment_feedback(
-                segment, i, track_profile
-            )
-            lines.extend(segment_feedback)
-            lines.append("")  # Blank line between segments
+            yield from self._format_segment_feedback(segment, i, track_profile)
+            yield ""  # Blank line between segments
         
         # Overall summary advice
         summary = self._generate_summary_advice(segments_to_show)
-        if self.use_emojis:
-            lines.append(f"📈 **Overall advice:** {summary}")
-        else:
-            lines.append(f"**Overall advice:** {summary}")
-        
-        return "\n".join(lines)
+        yield f"{self._advice_prefix} {summary}"
     
     def _generate_perfect_lap_feedback(self, track_name: str) -> str:
         """Generate feedback when no time loss detected (perfect lap)."""
-        if self.use_emojis:
-            return (
-                f"🏆 **Perfect Lap: {track_name}**\n\n"
-                "✨ Congratulations! Your lap matches the ideal line.\n"
-                "No significant time losses detected. Excellent driving!"
-            )
-        else:
-            return (
-                f"**Perfect Lap: {track_name}**\n\n"
-                "Congratulations! Your lap matches the ideal line.\n"
-                "No significant time losses detected. Excellent driving!"
-            )
+        return (
+            f"{self._perfect_prefix}**Perfect Lap: {track_name}**\n\n"
+            f"{self._congrats_line}"
+            "No significant time losses detected. Excellent driving!"
+        )
     
     def _format_segment_feedback(
         self,
@@ -139,11 +231,12 @@ class MatheCoachFeedbackGenerator:
         lines = []
         
         # Segment header with rank
-        if self.use_emojis:
-            rank_emoji = self._get_rank_emoji(rank)
-            lines.append(f"{rank_emoji} **Segment {segment.segment_id}** ({segment.time_loss:.2f}s loss)")
-        else:
-            lines.append(f"**{rank}. Segment {segment.segment_id}** ({segment.time_loss:.2f}s loss)")
+        lines.append(self._segment_header.format(
+            rank=rank,
+            rank_emoji=self._get_rank_emoji(rank),
+            segment_id=segment.segment_id,
+            time_loss=segment.time_loss
+        ))
         
         # Distance range
         lines.append(f"   📍 Distance: {segment.distance_start:.0f}m - {segment.distance_end:.0f}m")
@@ -166,54 +259,22 @@ class MatheCoachFeedbackGenerator:
         Returns:
             List of feedback lines specific to this error type.
         """
-        lines = []
+        feedback = _ERROR_FEEDBACK.get(segment.error_type)
+        if feedback is None:
+            return []
+        headline, speed_template, tip = feedback
         
         # Convert speed deltas from m/s to km/h for human readability
-        entry_kmh = segment.speed_delta_entry * 3.6
-        apex_kmh = segment.speed_delta_apex * 3.6
-        exit_kmh = segment.speed_delta_exit * 3.6
-        
-        if segment.error_type == ErrorType.EARLY_BRAKING:
-            lines.append(f"   • ⚠️ Braking too early")
-            lines.append(f"   • Entry speed: {entry_kmh:+.1f} km/h vs ideal")
-            if self.use_emojis:
-                lines.append(f"   • 💡 **Tip:** Brake later! Physics allows more grip here.")
-            else:
-                lines.append(f"   • **Tip:** Brake later! Physics allows more grip here.")
-        
-        elif segment.error_type == ErrorType.LATE_BRAKING:
-            lines.append(f"   • ⚠️ Braking too late")
-            lines.append(f"   • Apex speed: {apex_kmh:+.1f} km/h vs ideal")
-            if self.use_emojis:
-                lines.append(f"   • 💡 **Tip:** Brake earlier to hit the correct apex speed.")
-            else:
-                lines.append(f"   • **Tip:** Brake earlier to hit the correct apex speed.")
-        
-        elif segment.error_type == ErrorType.SLOW_CORNER:
-            lines.append(f"   • ⚠️ Slow through entire corner")
-            lines.append(f"   • Apex speed: {apex_kmh:+.1f} km/h vs ideal")
-            if self.use_emojis:
-                lines.append(f"   • 💡 **Tip:** Carry more mid-corner speed. The grip circle allows it.")
-            else:
-                lines.append(f"   • **Tip:** Carry more mid-corner speed. The grip circle allows it.")
-        
-        elif segment.error_type == ErrorType.LATE_THROTTLE:
-            lines.append(f"   • ⚠️ Throttle application too late")
-            lines.append(f"   • Exit speed: {exit_kmh:+.1f} km/h vs ideal")
-            if self.use_emojis:
-                lines.append(f"   • 💡 **Tip:** Get on throttle earlier on corner exit.")
-            else:
-                lines.append(f"   • **Tip:** Get on throttle earlier on corner exit.")
-        
-        elif segment.error_type == ErrorType.LINE_ERROR:
-            lines.append(f"   • ⚠️ Suboptimal racing line")
-            lines.append(f"   • Speed variance: entry {entry_kmh:+.1f}, apex {apex_kmh:+.1f}, exit {exit_kmh:+.1f} km/h")
-            if self.use_emojis:
-                lines.append(f"   • 💡 **Tip:** Review the racing line for this section.")
-            else:
-                lines.append(f"   • **Tip:** Review the racing line for this section.")
-        
-        return lines
+        speed_line = speed_template.format(
+            entry=segment.speed_delta_entry * 3.6,
+            apex=segment.speed_delta_apex * 3.6,
+            exit=segment.speed_delta_exit * 3.6
+        )
+        return [
+            f"   • ⚠️ {headline}",
+            f"   • {speed_line}",
+            f"   • {self._tip_prefix} {tip}",
+        ]
     
     def _generate_summary_advice(
         self,
@@ -231,28 +292,14 @@ class MatheCoachFeedbackGenerator:
             Summary advice string.
         """
         if not segments:
-            return "Keep up the excellent driving!"
-        
-        # Count error types
-        error_counts = {}
-        for segment in segments:
-            error_type = segment.error_type
-            error_counts[error_type] = error_counts.get(error_type, 0) + 1
+            return _NO_SEGMENTS_ADVICE
         
-        # Find most common error
+        # Count error types in a single pass; ties go to the error seen first
+        error_counts = Counter(segment.error_type for segment in segments)
         most_common_error = max(error_counts, key=error_counts.get)
         
         # Generate advice based on patterns
-        if most_common_error == ErrorType.LATE_THROTTLE:
-            return "Focus on corner exits for maximum time gains!"
-        elif most_common_error == ErrorType.EARLY_BRAKING:
-            return "Trust the brakes! You can brake later in most corners."
-        elif most_common_error == ErrorType.LATE_BRAKING:
-            return "Brake earlier to maintain control through corner apexes."
-        elif most_common_error == ErrorType.SLOW_CORNER:
-            return "Build confidence to carry more mid-corner speed."
-        else:  # LINE_ERROR
-            return "Review the racing line to find the optimal path."
+        return _SUMMARY_ADVICE.get(most_common_error, _DEFAULT_SUMMARY_ADVICE)
     
     def _get_rank_emoji(self, rank: int) -> str:
         """Get emoji for ranking number.
@@ -263,19 +310,7 @@ class MatheCoachFeedbackGenerator:
         Returns:
             Emoji string for the rank.
         """
-        emoji_map = {
-            1: "1️⃣",
-            2: "2️⃣",
-            3: "3️⃣",
-            4: "4️⃣",
-            5: "5️⃣",
-            6: "6️⃣",
-            7: "7️⃣",
-            8: "8️⃣",
-            9: "9️⃣",
-            10: "🔟"
-        }
-        return emoji_map.get(rank, f"{rank}.")
+        return _RANK_EMOJIS.get(rank) or f"{rank}."
     
     def generate_compact_feedback(
         self,
@@ -307,14 +342,4 @@ class MatheCoachFeedbackGenerator:
     
     def _get_error_emoji(self, error_type: ErrorType) -> str:
         """Get emoji for error type."""
-        if not self.use_emojis:
-            return ""
-        
-        emoji_map = {
-            ErrorType.EARLY_BRAKING: "🛑",
-            ErrorType.LATE_BRAKING: "⚡",
-            ErrorType.SLOW_CORNER: "🐌",
-            ErrorType.LATE_THROTTLE: "🚀",
-            ErrorType.LINE_ERROR: "〰️"
-        }
-        return emoji_map.get(error_type, "⚠️")
+        return self._error_emojis.get(error_type, self._unknown_error_emoji)
@@ -1,7 +1,13 @@
 """Service for ELO calculations in time trial scenarios."""
 
 import datetime
-from ..entities.driver_rating import DriverRating
+from bisect import bisect_right
+from ..entities.driver_rating import (
+    BASE_K_FACTOR,
+    K_TIME_DIFF_THRESHOLDS,
+    K_TIME_MULTIPLIERS,
+    DriverRating,
+)
 
 class TimeTrialEloService:
     """Service for calculating and updating ELO ratings based on time trials."""
@@ -67,16 +73,5 @@ class TimeTrialEloService:
         - Higher for small time differences
         - Lower for very old comparison times
         """
-        base_k = 32
-        
-        # Time-based adjustment
-        if time_difference < 0.1:      # Very close
-            time_multiplier = 1.5
-        elif time_difference < 0.5:    # Close
-            time_multiplier = 1.2
-        elif time_difference < 2.0:    # Moderate
-            time_multiplier = 1.0
-        else:                          # Large
-            time_multiplier = 0.7
-        
-        return base_k * time_multiplier * recency_weight
+        time_multiplier = K_TIME_MULTIPLIERS[bisect_right(K_TIME_DIFF_THRESHOLDS, time_difference)]
+        return BASE_K_FACTOR * time_multiplier * recency_weight
@@ -5,12 +5,19 @@ track centerlines from F1 25 telemetry samples using spatial binning and
 smoothing algorithms.
 """
 
+from operator import attrgetter
+
 import numpy as np
 from scipy.signal import savgol_filter
 from typing import List, Tuple
 from ..value_objects.telemetry_sample import TelemetrySample
 
 
+# Sample fields read by each reconstruction step, gathered in a single pass
+_CENTERLINE_FIELDS = attrgetter("world_position_x", "world_position_z", "lap_distance")
+_ELEVATION_FIELDS = attrgetter("world_position_y", "lap_distance")
+
+
 class TrackReconstructor:
     """Domain service for track geometry reconstruction from telemetry.
     
@@ -82,10 +89,10 @@ class TrackReconstructor:
                 f"track_length_m must be positive, got {track_length_m}"
             )
         
-        # Extract position and lap distance data
-        positions_x = np.array([s.world_position_x for s in samples])
-        positions_z = np.array([s.world_position_z for s in samples])
-        lap_distances = np.array([s.lap_distance for s in samples])
+        # Extract position and lap distance data in one walk over the samples
+        positions_x, positions_z, lap_distances = np.array(
+            [_CENTERLINE_FIELDS(s) for s in samples], dtype=np.float64
+        ).T
         
         # Normalize lap progress to [0, 1]
         normalized_progress = lap_distances / track_length_m
@@ -97,28 +104,13 @@ class TrackReconstructor:
         # Clamp bin indices to valid range [0, NUM_BINS-1]
         bin_indices = np.clip(bin_indices, 0, self.NUM_BINS - 1)
         
-        # Compute median centroid for each bin (robust to outliers)
-        centroids = []
-        bin_centers = []
-        
-        for bin_idx in range(self.NUM_BINS):
-            # Find all samples in this bin
-            mask = bin_indices == bin_idx
-            
-            if np.sum(mask) == 0:
-                # No samples in this bin, skip it
-                continue
-            
-            # Compute median position (more robust than mean)
-            median_x = np.median(positions_x[mask])
-            median_z = np.median(positions_z[mask])
-            
-            centroids.append([median_x, median_z])
-            bin_centers.append((bin_edges[bin_idx] + bin_edges[bin_idx + 1]) / 2)
+        # Compute median centroid for each bin (robust to outliers);
+        # bins without samples are skipped
+        occupied_bins, median_x = self._median_per_bin(bin_indices, positions_x, self.NUM_BINS)
+        _, median_z = self._median_per_bin(bin_indices, positions_z, self.NUM_BINS)
         
-        # Convert to numpy arrays
-        centroids = np.array(centroids)
-        bin_centers = np.array(bin_centers)
+        centroids = np.column_stack([median_x, median_z])
+        bin_centers = (bin_edges[occupied_bins] + bin_edges[occupied_bins + 1]) / 2
         
         # Sort centroids by lap progression order
         sort_indices = np.argsort(bin_centers)
@@ -316,9 +308,10 @@ class TrackReconstructor:
                 f"track_length_m must be positive, got {track_length_m}"
             )
         
-        # Extract elevation (Y) and lap distance data
-        elevations_y = np.array([s.world_position_y for s in samples])
-        lap_distances = np.array([s.lap_distance for s in samples])
+        # Extract elevation (Y) and lap distance data in one walk over the samples
+        elevations_y, lap_distances = np.array(
+            [_ELEVATION_FIELDS(s) for s in samples], dtype=np.float64
+        ).T
         
         # Normalize lap progress to [0, 1]
         normalized_progress = lap_distances / track_length_m
@@ -330,28 +323,13 @@ class TrackReconstructor:
         # Clamp bin indices to valid range [0, ELEVATION_BINS-1]
         bin_indices = np.clip(bin_indices, 0, self.ELEVATION_BINS - 1)
         
-        # Compute median elevation for each bin (robust to outliers)
-        elevation_profile = []
-        bin_centers = []
-        
-        for bin_idx in range(self.ELEVATION_BINS):
-            # Find all samples in this bin
-            mask = bin_indices == bin_idx
-            
-            if np.sum(mask) == 0:
-                # No samples in this bin, will interpolate later
-                continue
-            
-            # Compute median elevation (more robust than mean)
-            # Handles outliers from sensor errors or banking/camber effects
-            median_elevation = np.median(elevations_y[mask])
-            
-            elevation_profile.append(median_elevation)
-            bin_centers.append((bin_edges[bin_idx] + bin_edges[bin_idx + 1]) / 2)
-        
-        # Convert to numpy arrays
-        elevation_profile = np.array(elevation_profile)
-        bin_centers = np.array(bin_centers)
+        # Compute median elevation for each bin (more robust than mean);
+        # handles outliers from sensor errors or banking/camber effects.
+        # Bins without samples are interpolated later
+        occupied_bins, elevation_profile = self._median_per_bin(
+            bin_indices, elevations_y, self.ELEVATION_BINS
+        )
+        bin_centers = (bin_edges[occupied_bins] + bin_edges[occupied_bins + 1]) / 2
         
         # Sort by lap progression order
         sort_indices = np.argsort(bin_centers)
@@ -395,6 +373,42 @@ class TrackReconstructor:
         
         return elevation_profile
     
+    def _median_per_bin(
+        self,
+        bin_indices: np.ndarray,
+        values: np.ndarray,
+        num_bins: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute the median of values for every non-empty bin.
+        
+        Sorts the samples once by (bin, value) so each bin's values form a
+        contiguous sorted run, then reads the middle of every run, instead of
+        masking the full sample array once per bin.
+        
+        Args:
+            bin_indices: N-element array of bin indices in [0, num_bins).
+            values: N-element array of values to aggregate.
+            num_bins: Total number of bins.
+            
+        Returns:
+            Tuple of (occupied_bins, medians) where:
+            - occupied_bins: Ascending indices of bins with at least one sample
+            - medians: Median value of each occupied bin
+        """
+        sorted_values = values[np.lexsort((values, bin_indices))]
+        
+        counts = np.bincount(bin_indices, minlength=num_bins)
+        occupied_bins = np.flatnonzero(counts)
+        counts = counts[occupied_bins]
+        starts = np.cumsum(counts) - counts
+        
+        # Odd counts read the same middle element twice
+        lower_middle = sorted_values[starts + (counts - 1) // 2]
+        upper_middle = sorted_values[starts + counts // 2]
+        medians = (lower_middle + upper_middle) / 2
+        
+        return occupied_bins, medians
+    
     def _compute_cumulative_distance(self, centerline: np.ndarray) -> np.ndarray:
         """Compute cumulative Euclidean distance along centerline.
         
@@ -14,7 +14,7 @@ F1 25 UDP Packet Mapping:
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TelemetrySample:
     """Immutable value object representing a single F1 25 telemetry sample.
     
@@ -6,64 +6,64 @@ from typing import Optional
 class TimeFormat:
     """Immutable value object representing a lap time with validation."""
     
-    # Regex patterns for different time formats
-    PATTERNS = {
-        'mm:ss.mmm': re.compile(r'^(\d{1,2}):([0-5]\d)\.(\d{3})$'),  # 1:23.456
-        'ss.mmm': re.compile(r'^([0-5]?\d)\.(\d{3})$'),              # 23.456
-        'm:ss.mmm': re.compile(r'^(\d):([0-5]\d)\.(\d{3})$')          # 1:23.456
-    }
+    __slots__ = (
+        '_original_string',
+        '_minutes',
+        '_seconds',
+        '_milliseconds',
+        '_total_milliseconds',
+    )
+    
+    # Accepted formats in one pattern: m:ss.mmm / mm:ss.mmm (groups 1-2) or
+    # ss.mmm (group 3), followed by the milliseconds (group 4)
+    PATTERN = re.compile(r'^(?:(\d{1,2}):([0-5]\d)|([0-5]?\d))\.(\d{3})$')
     
     def __init__(self, time_string: str):
         self._original_string = time_string.strip()
         self._minutes, self._seconds, self._milliseconds = self._parse_time(self._original_string)
         self._total_milliseconds = self._calculate_total_milliseconds()
     
+    @classmethod
+    def from_components(cls, minutes: int, seconds: int, milliseconds: int) -> 'TimeFormat':
+        """Create a TimeFormat from already-split time components.
+        
+        Used for stored lap times, which were parsed on submission. Skips
+        formatting the components into a string and parsing it back, but
+        still applies the same range and plausibility checks.
+        """
+        if not (0 <= minutes < 100 and 0 <= seconds < 60 and 0 <= milliseconds < 1000):
+            raise ValueError(f"Invalid time components: {minutes}:{seconds}.{milliseconds}")
+        total_seconds = minutes * 60 + seconds + milliseconds / 1000
+        if not (30 <= total_seconds <= 300):
+            raise ValueError(f"Lap time {minutes}:{seconds:02d}.{milliseconds:03d} is not plausible (must be between 30s and 5min)")
+        
+        time_format = cls.__new__(cls)
+        time_format._minutes = minutes
+        time_format._seconds = seconds
+        time_format._milliseconds = milliseconds
+        time_format._original_string = time_format.formatted_display()
+        time_format._total_milliseconds = time_format._calculate_total_milliseconds()
+        return time_format
+    
     def _parse_time(self, time_string: str) -> tuple[int, int, int]:
         """Parse time string into minutes, seconds, milliseconds."""
         time_string = time_string.strip()
         
-        # Try mm:ss.mmm format first
-        match = self.PATTERNS['mm:ss.mmm'].match(time_string)
-        if match:
-            minutes = int(match.group(1))
-            seconds = int(match.group(2))
-            milliseconds = int(match.group(3))
-            
-            # Validate reasonable lap time (30 seconds to 5 minutes)
-            total_seconds = minutes * 60 + seconds + milliseconds / 1000
-            if not (30 <= total_seconds <= 300):
-                raise ValueError(f"Lap time {time_string} is not plausible (must be between 30s and 5min)")
-            
-            return minutes, seconds, milliseconds
+        match = self.PATTERN.match(time_string)
+        if not match:
+            raise ValueError(f"Invalid time format: {time_string}. Use formats like '1:23.456', '83.456', or '1:23.456'")
         
-        # Try ss.mmm format
-        match = self.PATTERNS['ss.mmm'].match(time_string)
-        if match:
-            seconds = int(match.group(1))
-            milliseconds = int(match.group(2))
-            
-            # Validate reasonable lap time
-            total_seconds = seconds + milliseconds / 1000
-            if not (30 <= total_seconds <= 300):
-                raise ValueError(f"Lap time {time_string} is not plausible (must be between 30s and 5min)")
-            
-            return 0, seconds, milliseconds
+        minutes_group, seconds_group, bare_seconds_group, milliseconds_group = match.groups()
+        minutes = int(minutes_group) if minutes_group is not None else 0
+        seconds = int(seconds_group if seconds_group is not None else bare_seconds_group)
+        milliseconds = int(milliseconds_group)
         
-        # Try m:ss.mmm format
-        match = self.PATTERNS['m:ss.mmm'].match(time_string)
-        if match:
-            minutes = int(match.group(1))
-            seconds = int(match.group(2))
-            milliseconds = int(match.group(3))
-            
-            # Validate reasonable lap time
-            total_seconds = minutes * 60 + seconds + milliseconds / 1000
-            if not (30 <= total_seconds <= 300):
-                raise ValueError(f"Lap time {time_string} is not plausible (must be between 30s and 5min)")
-            
-            return minutes, seconds, milliseconds
+        # Validate reasonable lap time (30 seconds to 5 minutes)
+        total_seconds = minutes * 60 + seconds + milliseconds / 1000
+        if not (30 <= total_seconds <= 300):
+            raise ValueError(f"Lap time {time_string} is not plausible (must be between 30s and 5min)")
         
-        raise ValueError(f"Invalid time format: {time_string}. Use formats like '1:23.456', '83.456', or '1:23.456'")
+        return minutes, seconds, milliseconds
     
     def _calculate_total_milliseconds(self) -> int:
         """Calculate total milliseconds for easy comparison."""
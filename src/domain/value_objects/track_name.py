@@ -1,7 +1,11 @@
 """Value object for F1 track name validation and normalization with rich media data."""
+from functools import lru_cache
 from typing import Dict, Any, Optional
 import random
 
+# Spaces and underscores in user input both map to the dash used in track keys
+_SEPARATORS_TO_DASH = str.maketrans(" _", "--")
+
 
 class TrackName:
     """Immutable value object representing an F1 track with rich media data."""
@@ -169,6 +173,9 @@ class TrackName:
     # Legacy support - display names extracted from TRACK_DATA
     VALID_TRACKS = {key: data['name'] for key, data in TRACK_DATA.items()}
     
+    # Track keys in a fixed sequence for random selection
+    TRACK_KEYS = tuple(TRACK_DATA)
+    
     # Alternative names/abbreviations
     ALIASES = {
         # Circuit abbreviations
@@ -235,26 +242,57 @@ class TrackName:
         'styria': 'austria'
     }
     
+    # Sorted track keys and aliases for help and error messages
+    VALID_OPTIONS = tuple(sorted([*TRACK_DATA, *ALIASES]))
+    
+    # Flag emoji per TRACK_DATA country
+    FLAG_EMOJIS = {
+        'Bahrain': '🇧🇭',
+        'Saudi Arabia': '🇸🇦', 
+        'Australia': '🇦🇺',
+        'Azerbaijan': '🇦🇿',
+        'USA (Miami)': '🇺🇸',
+        'Italy (Imola)': '🇮🇹',
+        'Monaco': '🇲🇨',
+        'Spain': '🇪🇸',
+        'Canada': '🇨🇦',
+        'Austria': '🇦🇹',
+        'United Kingdom': '🇬🇧',
+        'Hungary': '🇭🇺',
+        'Belgium': '🇧🇪',
+        'Netherlands': '🇳🇱',
+        'Italy': '🇮🇹',
+        'Singapore': '🇸🇬',
+        'Japan': '🇯🇵',
+        'Qatar': '🇶🇦',
+        'USA (Austin)': '🇺🇸',
+        'Mexico': '🇲🇽',
+        'Brazil': '🇧🇷',
+        'USA (Las Vegas)': '🇺🇸',
+        'UAE': '🇦🇪',
+        'China': '🇨🇳',
+        'France': '🇫🇷',
+        'Portugal': '🇵🇹'
+    }
+    
     def __init__(self, track_input: str):
         self._original_input = track_input.strip()
         self._normalized_name = self._normalize_track_name(self._original_input)
         
         if self._normalized_name not in self.TRACK_DATA:
-            valid_options = list(self.TRACK_DATA.keys()) + list(self.ALIASES.keys())
             raise ValueError(
                 f"Invalid track name: '{track_input}'. "
-                f"Valid options: {', '.join(sorted(valid_options))}"
+                f"Valid options: {', '.join(self.VALID_OPTIONS)}"
             )
     
     def _normalize_track_name(self, track_input: str) -> str:
         """Normalize track input to standard format."""
-        normalized = track_input.lower().strip()
-        normalized = normalized.replace(' ', '-')
-        normalized = normalized.replace('_', '-')
+        normalized = track_input.lower().strip().translate(_SEPARATORS_TO_DASH)
         
         # Check if it's an alias first
-        if normalized in self.ALIASES:
-            return self.ALIASES[normalized]
+        alias_key = self.ALIASES.get(normalized)
+        if alias_key is not None:
+            return alias_key
         
         # Check if it's already a valid track key
         if normalized in self.TRACK_DATA:
@@ -295,37 +333,8 @@ class TrackName:
     @property
     def flag_emoji(self) -> str:
         """Get a simple flag emoji for the track's country."""
-        # Simple emoji mapping for countries
-        emoji_map = {
-            'Bahrain': '🇧🇭',
-            'Saudi Arabia': '🇸🇦', 
-            'Australia': '🇦🇺',
-            'Azerbaijan': '🇦🇿',
-            'USA (Miami)': '🇺🇸',
-            'Italy (Imola)': '🇮🇹',
-            'Monaco': '🇲🇨',
-            'Spain': '🇪🇸',
-            'Canada': '🇨🇦',
-            'Austria': '🇦🇹',
-            'United Kingdom': '🇬🇧',
-            'Hungary': '🇭🇺',
-            'Belgium': '🇧🇪',
-            'Netherlands': '🇳🇱',
-            'Italy': '🇮🇹',
-            'Singapore': '🇸🇬',
-            'Japan': '🇯🇵',
-            'Qatar': '🇶🇦',
-            'USA (Austin)': '🇺🇸',
-            'Mexico': '🇲🇽',
-            'Brazil': '🇧🇷',
-            'USA (Las Vegas)': '🇺🇸',
-            'UAE': '🇦🇪',
-            'China': '🇨🇳',
-            'France': '🇫🇷',
-            'Portugal': '🇵🇹'
-        }
         country = self.TRACK_DATA[self._normalized_name]['country']
-        return emoji_map.get(country, '🏁')  # Default to racing flag
+        return self.FLAG_EMOJIS.get(country, '🏁')  # Default to racing flag
     
     @property
     def track_data(self) -> Dict[str, Any]:
@@ -351,16 +360,26 @@ class TrackName:
     def __hash__(self) -> int:
         return hash(self._normalized_name)
     
+    @classmethod
+    @lru_cache(maxsize=256)
+    def from_key(cls, track_input: str) -> 'TrackName':
+        """Get a shared TrackName for a stored track key.
+        
+        Instances are immutable, so rows that repeat the same handful of
+        track keys can reuse one validated instance instead of normalizing
+        the input again each time.
+        """
+        return cls(track_input)
+    
     @classmethod
     def get_all_valid_tracks(cls) -> list[str]:
         """Get all valid track options for help messages."""
-        return sorted(list(cls.TRACK_DATA.keys()) + list(cls.ALIASES.keys()))
+        return list(cls.VALID_OPTIONS)
     
     @classmethod
     def get_random_track(cls) -> 'TrackName':
         """Get a random track for challenges or examples."""
-        random_key = random.choice(list(cls.TRACK_DATA.keys()))
-        return cls(random_key)
+        return cls.from_key(random.choice(cls.TRACK_KEYS))
     
     @classmethod
     def get_all_track_data(cls) -> Dict[str, Dict[str, Any]]:
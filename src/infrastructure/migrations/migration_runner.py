@@ -16,6 +16,7 @@ Design principles:
 """
 
 import os
+import re
 import aiosqlite
 from pathlib import Path
 from typing import List, Optional
@@ -23,6 +24,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Leading digits of a migration filename, e.g. "001" in "001_telemetry_schema.sql"
+_VERSION_PREFIX = re.compile(r"\d+")
+
 
 class MigrationRunner:
     """Manages database schema migrations for telemetry database.
@@ -49,7 +53,7 @@ class MigrationRunner:
         Raises:
             Exception: If migration fails (database remains in previous state).
         """
-        logger.info(f"Starting migration runner for database: {self._database_path}")
+        logger.info("Starting migration runner for database: %s", self._database_path)
         
         # Enable foreign keys globally for the migration process
         async with aiosqlite.connect(self._database_path) as db:
@@ -58,7 +62,7 @@ class MigrationRunner:
         
         # Get list of migration files
         migration_files = self._discover_migration_files()
-        logger.info(f"Found {len(migration_files)} migration file(s)")
+        logger.info("Found %s migration file(s)", len(migration_files))
         
         if not migration_files:
             logger.warning("No migration files found in migrations directory")
@@ -66,22 +70,22 @@ class MigrationRunner:
         
         # Get current schema version
         current_version = await self._get_current_version()
-        logger.info(f"Current schema version: {current_version}")
+        logger.info("Current schema version: %s", current_version)
         
         # Apply each pending migration
         for migration_file in migration_files:
             migration_version = self._extract_version_from_filename(migration_file)
             
             if migration_version <= current_version:
-                logger.debug(f"Skipping already applied migration: {migration_file}")
+                logger.debug("Skipping already applied migration: %s", migration_file)
                 continue
             
-            logger.info(f"Applying migration: {migration_file}")
+            logger.info("Applying migration: %s", migration_file)
             await self._apply_migration(migration_file, migration_version)
-            logger.info(f"Successfully applied migration {migration_version}")
+            logger.info("Successfully applied migration %s", migration_version)
         
         final_version = await self._get_current_version()
-        logger.info(f"Migration complete. Final schema version: {final_version}")
+        logger.info("Migration complete. Final schema version: %s", final_version)
     
     def _discover_migration_files(self) -> List[str]:
         """Discover SQL migration files in migrations directory.
@@ -93,7 +97,7 @@ class MigrationRunner:
         migration_files = []
         
         if not self._migrations_dir.exists():
-            logger.error(f"Migrations directory not found: {self._migrations_dir}")
+            logger.error("Migrations directory not found: %s", self._migrations_dir)
             return migration_files
         
         # Find all .sql files
@@ -102,7 +106,7 @@ class MigrationRunner:
             
             # Skip non-migration SQL files (must start with digits)
             if not filename[0].isdigit():
-                logger.debug(f"Skipping non-migration file: {filename}")
+                logger.debug("Skipping non-migration file: %s", filename)
                 continue
             
             migration_files.append(filename)
@@ -124,23 +128,13 @@ class MigrationRunner:
         Raises:
             ValueError: If filename doesn't match expected format.
         """
-        try:
-            # Extract digits from start of filename
-            version_str = ""
-            for char in filename:
-                if char.isdigit():
-                    version_str += char
-                else:
-                    break
-            
-            if not version_str:
-                raise ValueError(f"No version number found in filename: {filename}")
-            
-            return int(version_str)
+        # Version is the run of digits at the start of the filename
+        match = _VERSION_PREFIX.match(filename)
+        if match is None:
+            logger.error("No version number found in migration filename '%s'", filename)
+            raise ValueError(f"Invalid migration filename format: {filename}")
         
-        except Exception as e:
-            logger.error(f"Failed to extract version from filename '{filename}': {e}")
-            raise ValueError(f"Invalid migration filename format: {filename}") from e
+        return int(match.group())
     
     async def _get_current_version(self) -> int:
         """Get current schema version from database.
@@ -169,7 +163,7 @@ class MigrationRunner:
                 return result[0] if result else 0
         
         except Exception as e:
-            logger.error(f"Failed to get current schema version: {e}")
+            logger.error("Failed to get current schema version: %s", e)
             raise
     
     async def _apply_migration(self, filename: str, version: int) -> None:
@@ -209,21 +203,21 @@ class MigrationRunner:
                 # Commit transaction
                 await db.commit()
                 
-                logger.info(f"Migration {version} applied successfully")
+                logger.info("Migration %s applied successfully", version)
             
             except aiosqlite.OperationalError as e:
                 # Handle idempotent migrations (e.g., duplicate column errors)
                 error_msg = str(e).lower()
                 if "duplicate column" in error_msg:
-                    logger.warning(f"Migration {version} already applied (duplicate column detected), skipping")
+                    logger.warning("Migration %s already applied (duplicate column detected), skipping", version)
                     # Migration already applied, this is fine
                     return
                 else:
-                    logger.error(f"Migration {version} failed: {e}")
+                    logger.error("Migration %s failed: %s", version, e)
                     raise
             
             except Exception as e:
-                logger.error(f"Migration {version} failed: {e}")
+                logger.error("Migration %s failed: %s", version, e)
                 # Transaction automatically rolled back on exception
                 raise
     
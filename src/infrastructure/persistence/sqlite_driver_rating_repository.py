@@ -34,22 +34,29 @@ class SQLiteDriverRatingRepository(DriverRatingRepository):
     
     async def save(self, driver_rating: DriverRating) -> None:
         """Save or update a driver rating."""
+        await self.save_all([driver_rating])
+    
+    async def save_all(self, driver_ratings: List[DriverRating]) -> None:
+        """Save or update several driver ratings in one transaction."""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.executemany("""
                 INSERT OR REPLACE INTO driver_ratings 
                 (user_id, username, current_elo, peak_elo, matches_played, wins, losses, last_updated)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                driver_rating.user_id,
-                driver_rating.username,
-                driver_rating.current_elo,
-                driver_rating.peak_elo,
-                driver_rating.matches_played,
-                driver_rating.wins,
-                driver_rating.losses,
-                driver_rating.last_updated.isoformat()
-            ))
+            """, [
+                (
+                    driver_rating.user_id,
+                    driver_rating.username,
+                    driver_rating.current_elo,
+                    driver_rating.peak_elo,
+                    driver_rating.matches_played,
+                    driver_rating.wins,
+                    driver_rating.losses,
+                    driver_rating.last_updated.isoformat()
+                )
+                for driver_rating in driver_ratings
+            ])
             conn.commit()
     
     async def find_by_user_id(self, user_id: str) -> Optional[DriverRating]:
@@ -78,6 +85,36 @@ class SQLiteDriverRatingRepository(DriverRatingRepository):
                 last_updated=datetime.fromisoformat(row[7])
             )
     
+    async def find_by_user_ids(self, user_ids: List[str]) -> List[DriverRating]:
+        """Find the driver ratings that exist for the given user IDs."""
+        if not user_ids:
+            return []
+        
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            placeholders = ", ".join("?" * len(user_ids))
+            cursor.execute(f"""
+                SELECT user_id, username, current_elo, peak_elo, matches_played, 
+                       wins, losses, last_updated
+                FROM driver_ratings 
+                WHERE user_id IN ({placeholders})
+            """, list(user_ids))
+            
+            ratings = []
+            for row in cursor.fetchall():
+                ratings.append(DriverRating(
+                    user_id=row[0],
+                    username=row[1],
+                    current_elo=row[2],
+                    peak_elo=row[3],
+                    matches_played=row[4],
+                    wins=row[5],
+                    losses=row[6],
+                    last_updated=datetime.fromisoformat(row[7])
+                ))
+            
+            return ratings
+    
     async def find_all_ratings(self) -> List[DriverRating]:
         """Find all driver ratings."""
         with sqlite3.connect(self.db_path) as conn:
@@ -104,6 +141,18 @@ class SQLiteDriverRatingRepository(DriverRatingRepository):
             
             return ratings
     
+    async def get_rating_statistics(self) -> dict:
+        """Get the number of rated drivers and their average ELO."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*), AVG(current_elo) FROM driver_ratings")
+            total_drivers, average_elo = cursor.fetchone()
+            
+            return {
+                'total_drivers': total_drivers,
+                'average_elo': average_elo or 0
+            }
+    
     async def find_top_ratings(self, limit: int = 10) -> List[DriverRating]:
         """Find top driver ratings by ELO."""
         with sqlite3.connect(self.db_path) as conn:
@@ -1,17 +1,29 @@
 """SQLite implementation of the LapTimeRepository interface."""
+import asyncio
+import logging
 import sqlite3
 import aiosqlite
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from ...domain.entities.lap_time import LapTime
 from ...domain.interfaces.lap_time_repository import LapTimeRepository
 from ...domain.value_objects.time_format import TimeFormat
 from ...domain.value_objects.track_name import TrackName
+from .sqlite_tuning import SQLITE_PRAGMAS
+
+logger = logging.getLogger(__name__)
 
 
 class SQLiteLapTimeRepository(LapTimeRepository):
-    """SQLite adapter implementing the LapTimeRepository port."""
+    """SQLite adapter implementing the LapTimeRepository port.
+    
+    All operations share one lazily opened aiosqlite connection and hold an
+    asyncio lock while they use it, so a read never sees another coroutine's
+    uncommitted write and no statement lands inside another coroutine's
+    transaction. Call close() on shutdown to release the connection.
+    """
     
     def __init__(self, database_path: Optional[str] = None):
         if database_path is None:
@@ -34,10 +46,63 @@ class SQLiteLapTimeRepository(LapTimeRepository):
                 self._database_path = possible_paths[0]
         else:
             self._database_path = database_path
+        
+        self._connection: Optional[aiosqlite.Connection] = None
+        self._connection_lock = asyncio.Lock()
+        self._access_lock = asyncio.Lock()
+        self._schema_ready = False
+    
+    async def _get_connection(self) -> aiosqlite.Connection:
+        """Return the shared connection, opening and tuning it on first use."""
+        if self._connection is None:
+            async with self._connection_lock:
+                if self._connection is None:
+                    db = aiosqlite.connect(self._database_path)
+                    # Don't keep the interpreter alive if close() is never reached
+                    db.daemon = True
+                    await db
+                    db.row_factory = aiosqlite.Row
+                    # Tuned once for the lifetime of the shared connection
+                    await db.executescript(SQLITE_PRAGMAS)
+                    self._connection = db
+        return self._connection
+    
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Yield the shared connection for read-only queries.
+        
+        Reads take the same lock as writes: an open write transaction on the
+        shared connection would otherwise be visible before it commits.
+        """
+        db = await self._get_connection()
+        async with self._access_lock:
+            yield db
+    
+    @asynccontextmanager
+    async def _writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Yield the shared connection while holding the access lock."""
+        db = await self._get_connection()
+        async with self._access_lock:
+            try:
+                yield db
+            except BaseException:
+                # Never leave a half-finished transaction on the shared connection
+                await db.rollback()
+                raise
+    
+    async def close(self) -> None:
+        """Close the shared connection if it has been opened."""
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+            self._schema_ready = False
     
     async def _ensure_table_exists(self):
         """Create the lap_times table if it doesn't exist."""
-        async with aiosqlite.connect(self._database_path) as db:
+        if self._schema_ready:
+            return
+        
+        async with self._writer() as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS lap_times (
                     lap_id TEXT PRIMARY KEY,
@@ -80,71 +145,53 @@ class SQLiteLapTimeRepository(LapTimeRepository):
             await db.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON lap_times(created_at DESC)")
             
             await db.commit()
+            self._schema_ready = True
     
     async def save(self, lap_time: LapTime) -> str:
         """Save a lap time and return the generated ID."""
         await self._ensure_table_exists()
         
-        # Debug: Check sectors before saving
-        print(f"🔍 REPOSITORY: About to save lap with sectors: S1={lap_time.sector1_ms}, S2={lap_time.sector2_ms}, S3={lap_time.sector3_ms}")
-        
         lap_id = str(uuid.uuid4())
         
-        try:
-            async with aiosqlite.connect(self._database_path) as db:
-                print(f"🔍 REPOSITORY: Using database path: {self._database_path}")
-                
-                cursor = await db.execute("""
-                    INSERT INTO lap_times (
-                        lap_id, user_id, username, track_key,
-                        time_minutes, time_seconds, time_milliseconds, total_milliseconds,
-                        is_personal_best, is_overall_best, is_bot,
-                        sector1_ms, sector2_ms, sector3_ms, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    lap_id,
-                    lap_time.user_id,
-                    lap_time.username,
-                    lap_time.track_name.key,
-                    lap_time.time_format.minutes,
-                    lap_time.time_format.seconds,
-                    lap_time.time_format.milliseconds,
-                    lap_time.time_format.total_milliseconds,
-                    lap_time.is_personal_best,
-                    lap_time.is_overall_best,
-                    False,  # is_bot - always False since we prevent bots from submitting
-                    lap_time.sector1_ms,
-                    lap_time.sector2_ms,
-                    lap_time.sector3_ms,
-                    lap_time.created_at.isoformat()
-                ))
-                
-                print(f"🔍 REPOSITORY: Insert executed, rowcount: {cursor.rowcount}")
-                await db.commit()
-                print(f"🔍 REPOSITORY: Transaction committed successfully!")
-                
-                # Verify the data was actually saved
-                verify_cursor = await db.execute("SELECT COUNT(*) FROM lap_times WHERE lap_id = ?", (lap_id,))
-                count = (await verify_cursor.fetchone())[0]
-                print(f"🔍 REPOSITORY: Verification - found {count} records with lap_id={lap_id}")
-                
-                if count == 0:
-                    print(f"❌ REPOSITORY: Critical error - data not found after commit!")
-                else:
-                    print(f"✅ REPOSITORY: Data successfully persisted!")
-                
-        except Exception as save_error:
-            print(f"❌ REPOSITORY: Save error: {save_error}")
-            raise
+        async with self._writer() as db:
+            await db.execute("""
+                INSERT INTO lap_times (
+                    lap_id, user_id, username, track_key,
+                    time_minutes, time_seconds, time_milliseconds, total_milliseconds,
+                    is_personal_best, is_overall_best, is_bot,
+                    sector1_ms, sector2_ms, sector3_ms, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                lap_id,
+                lap_time.user_id,
+                lap_time.username,
+                lap_time.track_name.key,
+                lap_time.time_format.minutes,
+                lap_time.time_format.seconds,
+                lap_time.time_format.milliseconds,
+                lap_time.time_format.total_milliseconds,
+                lap_time.is_personal_best,
+                lap_time.is_overall_best,
+                False,  # is_bot - always False since we prevent bots from submitting
+                lap_time.sector1_ms,
+                lap_time.sector2_ms,
+                lap_time.sector3_ms,
+                lap_time.created_at.isoformat()
+            ))
+            await db.commit()
         
+        logger.debug(
+            "Saved lap %s to %s (sectors: S1=%s, S2=%s, S3=%s)",
+            lap_id, self._database_path,
+            lap_time.sector1_ms, lap_time.sector2_ms, lap_time.sector3_ms
+        )
         return lap_id
     
     async def find_by_id(self, lap_id: str) -> Optional[LapTime]:
         """Find a lap time by its ID."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._reader() as db:
             cursor = await db.execute(
                 "SELECT * FROM lap_times WHERE lap_id = ?", (lap_id,)
             )
@@ -159,8 +206,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Find the best (fastest) lap time for a specific track."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._reader() as db:
             cursor = await db.execute("""
                 SELECT * FROM lap_times 
                 WHERE track_key = ? 
@@ -178,8 +224,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Find the best lap time for a specific user on a specific track."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._reader() as db:
             cursor = await db.execute("""
                 SELECT * FROM lap_times 
                 WHERE user_id = ? AND track_key = ?
@@ -197,8 +242,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Find the top lap times for a specific track (absolute fastest times, not best per user)."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._reader() as db:
             cursor = await db.execute("""
                 SELECT * FROM lap_times 
                 WHERE track_key = ?
@@ -213,8 +257,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Find all lap times for a specific user."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._reader() as db:
             cursor = await db.execute("""
                 SELECT * FROM lap_times 
                 WHERE user_id = ?
@@ -228,8 +271,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Find recent lap times for a specific track."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._reader() as db:
             cursor = await db.execute("""
                 SELECT * FROM lap_times 
                 WHERE track_key = ?
@@ -244,31 +286,18 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Get statistics for a specific user."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
-            # Total laps
-            cursor = await db.execute("SELECT COUNT(*) FROM lap_times WHERE user_id = ?", (user_id,))
-            total_laps = (await cursor.fetchone())[0]
-            
-            # Personal bests count
-            cursor = await db.execute(
-                "SELECT COUNT(*) FROM lap_times WHERE user_id = ? AND is_personal_best = 1", 
-                (user_id,)
-            )
-            personal_bests = (await cursor.fetchone())[0]
-            
-            # Overall bests count
-            cursor = await db.execute(
-                "SELECT COUNT(*) FROM lap_times WHERE user_id = ? AND is_overall_best = 1", 
-                (user_id,)
-            )
-            overall_bests = (await cursor.fetchone())[0]
-            
-            # Average time (across all tracks)
-            cursor = await db.execute(
-                "SELECT AVG(total_milliseconds) FROM lap_times WHERE user_id = ?", 
-                (user_id,)
-            )
-            avg_time_ms = (await cursor.fetchone())[0]
+        async with self._reader() as db:
+            # All counters in one pass over the user's laps; SUM over no rows
+            # is NULL, so the flag counts fall back to 0
+            cursor = await db.execute("""
+                SELECT COUNT(*),
+                       COALESCE(SUM(is_personal_best = 1), 0),
+                       COALESCE(SUM(is_overall_best = 1), 0),
+                       AVG(total_milliseconds)
+                FROM lap_times
+                WHERE user_id = ?
+            """, (user_id,))
+            total_laps, personal_bests, overall_bests, avg_time_ms = await cursor.fetchone()
             avg_time_seconds = avg_time_ms / 1000.0 if avg_time_ms else 0
             
             return {
@@ -282,32 +311,18 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Get statistics for a specific track."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
-            # Total laps on track
-            cursor = await db.execute("SELECT COUNT(*) FROM lap_times WHERE track_key = ?", (track.key,))
-            total_laps = (await cursor.fetchone())[0]
-            
-            # Unique drivers
-            cursor = await db.execute(
-                "SELECT COUNT(DISTINCT user_id) FROM lap_times WHERE track_key = ?", 
-                (track.key,)
-            )
-            unique_drivers = (await cursor.fetchone())[0]
-            
-            # Best time
-            cursor = await db.execute(
-                "SELECT MIN(total_milliseconds) FROM lap_times WHERE track_key = ?", 
-                (track.key,)
-            )
-            best_time_ms = (await cursor.fetchone())[0]
+        async with self._reader() as db:
+            # All track figures in one pass over the track's laps
+            cursor = await db.execute("""
+                SELECT COUNT(*),
+                       COUNT(DISTINCT user_id),
+                       MIN(total_milliseconds),
+                       AVG(total_milliseconds)
+                FROM lap_times
+                WHERE track_key = ?
+            """, (track.key,))
+            total_laps, unique_drivers, best_time_ms, avg_time_ms = await cursor.fetchone()
             best_time_seconds = best_time_ms / 1000.0 if best_time_ms else 0
-            
-            # Average time
-            cursor = await db.execute(
-                "SELECT AVG(total_milliseconds) FROM lap_times WHERE track_key = ?", 
-                (track.key,)
-            )
-            avg_time_ms = (await cursor.fetchone())[0]
             avg_time_seconds = avg_time_ms / 1000.0 if avg_time_ms else 0
             
             return {
@@ -321,7 +336,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Get the fastest sectors for a specific track from all drivers."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
+        async with self._reader() as db:
             # Find fastest sector 1
             cursor = await db.execute("""
                 SELECT MIN(sector1_ms) as fastest_s1, username 
@@ -367,13 +382,11 @@ class SQLiteLapTimeRepository(LapTimeRepository):
     def _row_to_lap_time(self, row: aiosqlite.Row) -> LapTime:
         """Convert a database row to a LapTime entity."""
         try:
-            # Reconstruct the time format from components
-            time_string = f"{row['time_minutes']}:{row['time_seconds']:02d}.{row['time_milliseconds']:03d}"
-            if row['time_minutes'] == 0:
-                time_string = f"{row['time_seconds']}.{row['time_milliseconds']:03d}"
-
-            time_format = TimeFormat(time_string)
-            track_name = TrackName(row['track_key'])
+            # Stored components were validated on submission; rebuild directly
+            time_format = TimeFormat.from_components(
+                row['time_minutes'], row['time_seconds'], row['time_milliseconds']
+            )
+            track_name = TrackName.from_key(row['track_key'])
 
             # Extract sector data, defaulting to None if column is not present
             sector1_ms = row['sector1_ms'] if 'sector1_ms' in row.keys() else None
@@ -408,7 +421,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Delete a lap time by ID. Returns True if successful."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
+        async with self._writer() as db:
             cursor = await db.execute("DELETE FROM lap_times WHERE lap_id = ?", (lap_id,))
             await db.commit()
             
@@ -419,8 +432,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Find all lap times for a user on a specific track, ordered by most recent first."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._reader() as db:
             cursor = await db.execute("""
                 SELECT * FROM lap_times 
                 WHERE user_id = ? AND track_key = ?
@@ -434,8 +446,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Find a specific lap time for a user on a track with exact time match."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._reader() as db:
             cursor = await db.execute("""
                 SELECT * FROM lap_times 
                 WHERE user_id = ? AND track_key = ? AND total_milliseconds = ?
@@ -453,7 +464,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         """Delete all lap times for a user on a specific track. Returns number of deleted records."""
         await self._ensure_table_exists()
         
-        async with aiosqlite.connect(self._database_path) as db:
+        async with self._writer() as db:
             cursor = await db.execute(
                 "DELETE FROM lap_times WHERE user_id = ? AND track_key = ?", 
                 (user_id, track.key)
@@ -467,7 +478,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         await self._ensure_table_exists()
         
         try:
-            async with aiosqlite.connect(self._database_path) as db:
+            async with self._writer() as db:
                 cursor = await db.execute(
                     "UPDATE lap_times SET username = ? WHERE user_id = ?",
                     (new_username, user_id)
@@ -486,7 +497,7 @@ class SQLiteLapTimeRepository(LapTimeRepository):
         try:
             await self._ensure_table_exists()
             
-            async with aiosqlite.connect(self._database_path) as db:
+            async with self._writer() as db:
                 # Delete all records from the lap_times table
                 await db.execute("DELETE FROM lap_times")
                 await db.commit()
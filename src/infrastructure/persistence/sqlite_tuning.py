@@ -0,0 +1,32 @@
+"""Connection tuning shared by the SQLite repositories and maintenance scripts."""
+import sqlite3
+from typing import Optional
+
+
+# Connection-level tuning: WAL avoids the rollback-journal fsync on every
+# commit and lets readers proceed while a write is in progress, and
+# synchronous=NORMAL is safe under WAL.
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA mmap_size=268435456;
+"""
+
+
+def connect(db_path: str, row_factory: Optional[type] = None) -> sqlite3.Connection:
+    """Open a SQLite connection with the write-tuned PRAGMAs applied.
+
+    Args:
+        db_path: Path to the database file.
+        row_factory: Optional row factory, e.g. sqlite3.Row.
+
+    Returns:
+        Open, tuned connection.
+    """
+    conn = sqlite3.connect(db_path)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
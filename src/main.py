@@ -9,7 +9,6 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.presentation.bot.f1_bot import F1LapBot
 from src.presentation.api.telemetry_api import TelemetryAPI
-from src.infrastructure.persistence.sqlite_lap_time_repository import SQLiteLapTimeRepository
 from src.infrastructure.persistence.sqlite_telemetry_repository import SQLiteTelemetryRepository
 from src.infrastructure.migrations.migration_runner import run_telemetry_migrations
 from src.version import get_version, get_version_info
@@ -87,13 +86,15 @@ async def main():
     api_host = os.getenv('API_HOST', '0.0.0.0')
     api_port = int(os.getenv('API_PORT', '8080'))
     
-    # Create shared repository instances
-    lap_time_repository = SQLiteLapTimeRepository()
-    telemetry_repository = SQLiteTelemetryRepository()  # For Mathe-Coach telemetry traces
-    
     # Create Discord bot
     bot = F1LapBot()
     
+    # Create shared repository instances
+    # The API reuses the bot's lap time repository so the whole process
+    # works through a single lap_times connection
+    lap_time_repository = bot.lap_time_repository
+    telemetry_repository = SQLiteTelemetryRepository()  # For Mathe-Coach telemetry traces
+    
     # Create HTTP API server for telemetry
     api_server = TelemetryAPI(
         lap_time_repository, 
@@ -150,6 +151,12 @@ async def main():
                 await bot.close()
         except Exception as e:
             print(f"⚠️  Error stopping Discord bot: {e}")
+        
+        # Close the shared lap time database connection
+        try:
+            await lap_time_repository.close()
+        except Exception as e:
+            print(f"⚠️  Error closing lap time database: {e}")
             
         print("👋 Bot stopped.")
 
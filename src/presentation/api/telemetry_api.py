@@ -3,6 +3,7 @@ import asyncio
 import json
 import logging
 from datetime import datetime
+from operator import itemgetter
 from typing import Optional
 
 from aiohttp import web, WSMsgType
@@ -16,6 +17,17 @@ from src.domain.value_objects.track_name import TrackName
 from src.infrastructure.persistence.sqlite_lap_time_repository import SQLiteLapTimeRepository
 import discord
 
+# Reads a submitted sample's fields in TelemetrySample field order
+_get_sample_fields = itemgetter(
+    'timestamp_ms',
+    'world_position_x', 'world_position_y', 'world_position_z',
+    'world_velocity_x', 'world_velocity_y', 'world_velocity_z',
+    'g_force_lateral', 'g_force_longitudinal', 'yaw',
+    'speed', 'throttle', 'steer', 'brake',
+    'gear', 'engine_rpm', 'drs',
+    'lap_distance', 'lap_number',
+)
+
 
 class TelemetryAPI:
     """HTTP API server for receiving telemetry data."""
@@ -25,7 +37,9 @@ class TelemetryAPI:
         self.port = port
         self.lap_time_repository = lap_time_repository
         self.driver_rating_repository = driver_rating_repository
-        self.submit_use_case = SubmitLapTimeUseCase(lap_time_repository, driver_rating_repository)
+        # Without a rating repository the submission leaves the ELO update to
+        # the background worker, so each lap is rated exactly once
+        self.submit_use_case = SubmitLapTimeUseCase(lap_time_repository)
         self.update_elo_use_case = UpdateEloRatingsUseCase(driver_rating_repository, lap_time_repository)
         self.discord_bot = discord_bot  # Reference to Discord bot for user lookup
         # Increase max request size to 10MB for telemetry traces (300-500 samples per lap)
@@ -33,6 +47,11 @@ class TelemetryAPI:
         self.runner: Optional[web.AppRunner] = None
         self.site: Optional[web.TCPSite] = None
         
+        # ELO updates run on one background worker, in submission order,
+        # so the submit response does not wait for the rating recalculation
+        self._elo_queue: asyncio.Queue = asyncio.Queue()
+        self._elo_task: Optional[asyncio.Task] = None
+        
         # Setup routes
         self._setup_routes()
         self._setup_cors()
@@ -72,6 +91,8 @@ class TelemetryAPI:
             self.site = web.TCPSite(self.runner, self.host, self.port)
             await self.site.start()
             
+            self._elo_task = asyncio.create_task(self._elo_update_worker())
+            
             print(f"🌐 Telemetry API server started on http://{self.host}:{self.port}")
             print(f"📡 Ready to receive telemetry data at /api/telemetry/submit")
             
@@ -85,17 +106,43 @@ class TelemetryAPI:
             await self.site.stop()
         if self.runner:
             await self.runner.cleanup()
+        if self._elo_task:
+            # Apply the ELO updates still queued before shutting down
+            await self._elo_queue.join()
+            self._elo_task.cancel()
+            self._elo_task = None
         print("🛑 Telemetry API server stopped")
     
+    async def _elo_update_worker(self):
+        """Apply queued ELO updates, batching laps that arrived together."""
+        while True:
+            lap_times = [await self._elo_queue.get()]
+            # Laps submitted while the previous batch was running are
+            # applied together, oldest first
+            while not self._elo_queue.empty():
+                lap_times.append(self._elo_queue.get_nowait())
+            try:
+                await self.update_elo_use_case.execute_batch(lap_times)
+            except Exception as e:
+                self.logger.error(
+                    "Error updating ELO ratings for laps %s: %s",
+                    ", ".join(str(lap_time.lap_id) for lap_time in lap_times), e
+                )
+            finally:
+                for _ in lap_times:
+                    self._elo_queue.task_done()
+    
     async def submit_telemetry(self, request: Request) -> Response:
         """Handle telemetry data submission from UDP listeners."""
         try:
             # Parse JSON request
             data = await request.json()
             
-            # Full debug logging of received data
             print(f"\n📡 TELEMETRY API: Received request")
-            print(f"🔍 Full request data: {json.dumps(data, indent=2)}")
+            
+            # Full dump of the received data only when debug logging is on
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Full request data: %s", json.dumps(data, indent=2))
             
             # Extract and validate required fields
             required_fields = {'user_id': 'user_id', 'time': 'time', 'track': 'track'}
@@ -137,11 +184,11 @@ class TelemetryAPI:
                     sector3_ms=sector3_ms
                 )
 
-                # Update ELO ratings
-                await self.update_elo_use_case.execute(lap_time)
+                # Queue the ELO update for the background worker
+                self._elo_queue.put_nowait(lap_time)
 
                 # Log successful submission
-                self.logger.info(f"Telemetry lap submitted: {username} - {time_str} on {track_str}")
+                self.logger.info("Telemetry lap submitted: %s - %s on %s", username, time_str, track_str)
                 print(f"📊 Telemetry lap received: {username} - {time_str} on {track_str}")
                 
                 # Return success response
@@ -178,7 +225,7 @@ class TelemetryAPI:
                 status=400
             )
         except Exception as e:
-            self.logger.error(f"Error processing telemetry submission: {e}")
+            self.logger.error("Error processing telemetry submission: %s", e)
             return web.json_response(
                 {'error': 'Internal server error'},
                 status=500
@@ -260,7 +307,7 @@ class TelemetryAPI:
             }, status=200)
         
         except Exception as e:
-            self.logger.error(f"Error registering session: {e}")
+            self.logger.error("Error registering session: %s", e)
             return web.json_response(
                 {'error': f'Failed to register session: {str(e)}'},
                 status=500
@@ -312,30 +359,27 @@ class TelemetryAPI:
             # Add telemetry samples (must be done before marking complete)
             for sample_data in samples:
                 try:
+                    (
+                        timestamp_ms,
+                        position_x, position_y, position_z,
+                        velocity_x, velocity_y, velocity_z,
+                        g_force_lateral, g_force_longitudinal, yaw,
+                        speed, throttle, steer, brake,
+                        gear, engine_rpm, drs,
+                        lap_distance, sample_lap_number,
+                    ) = _get_sample_fields(sample_data)
                     sample = TelemetrySample(
-                        timestamp_ms=int(sample_data['timestamp_ms']),
-                        world_position_x=float(sample_data['world_position_x']),
-                        world_position_y=float(sample_data['world_position_y']),
-                        world_position_z=float(sample_data['world_position_z']),
-                        world_velocity_x=float(sample_data['world_velocity_x']),
-                        world_velocity_y=float(sample_data['world_velocity_y']),
-                        world_velocity_z=float(sample_data['world_velocity_z']),
-                        g_force_lateral=float(sample_data['g_force_lateral']),
-                        g_force_longitudinal=float(sample_data['g_force_longitudinal']),
-                        yaw=float(sample_data['yaw']),
-                        speed=float(sample_data['speed']),
-                        throttle=float(sample_data['throttle']),
-                        steer=float(sample_data['steer']),
-                        brake=float(sample_data['brake']),
-                        gear=int(sample_data['gear']),
-                        engine_rpm=int(sample_data['engine_rpm']),
-                        drs=int(sample_data['drs']),
-                        lap_distance=float(sample_data['lap_distance']),
-                        lap_number=int(sample_data['lap_number'])
+                        int(timestamp_ms),
+                        float(position_x), float(position_y), float(position_z),
+                        float(velocity_x), float(velocity_y), float(velocity_z),
+                        float(g_force_lateral), float(g_force_longitudinal), float(yaw),
+                        float(speed), float(throttle), float(steer), float(brake),
+                        int(gear), int(engine_rpm), int(drs),
+                        float(lap_distance), int(sample_lap_number)
                     )
                     lap_trace.add_sample(sample)
                 except (KeyError, ValueError) as e:
-                    self.logger.warning(f"Skipping invalid sample: {e}")
+                    self.logger.warning("Skipping invalid sample: %s", e)
                     continue
             
             # Now mark lap as complete with final time
@@ -356,7 +400,7 @@ class TelemetryAPI:
             }, status=200)
         
         except Exception as e:
-            self.logger.error(f"Error submitting telemetry trace: {e}")
+            self.logger.error("Error submitting telemetry trace: %s", e)
             import traceback
             traceback.print_exc()
             return web.json_response(
@@ -374,7 +418,7 @@ class TelemetryAPI:
                     # Use display name if available, otherwise username
                     return user.display_name or user.name
         except Exception as e:
-            self.logger.warning(f"Could not fetch Discord user {user_id}: {e}")
+            self.logger.warning("Could not fetch Discord user %s: %s", user_id, e)
         
         # Fallback: Use last 4 digits of user ID
         return f"Player_{user_id[-4:]}"
@@ -204,13 +204,13 @@ class F1LapBot(commands.Bot):
             from ...domain.value_objects.track_name import TrackName
             
             # Get all available tracks that have lap times
-            all_track_keys = list(TrackName.TRACK_DATA.keys())
+            all_track_keys = TrackName.TRACK_KEYS
             tracks_with_times = []
             
             # Collect all tracks that have lap times
             for track_key in all_track_keys:
                 try:
-                    track = TrackName(track_key)
+                    track = TrackName.from_key(track_key)
                     best_time = await self.lap_time_repository.find_best_by_track(track)
                     if best_time:
                         tracks_with_times.append((track_key, track, best_time))
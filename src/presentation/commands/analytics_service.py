@@ -1,11 +1,34 @@
 """Service layer for analytics calculations and data aggregation."""
-import statistics
-from typing import Dict, List, Tuple, Optional, Set
+import heapq
+import math
+from typing import Dict, Iterable, List, Tuple, Optional, Set
 from collections import defaultdict
 from ...domain.entities.lap_time import LapTime
 from ...domain.value_objects.track_name import TrackName
 
 
+def _mean_and_stdev(values: Iterable[float]) -> Tuple[float, float]:
+    """
+    Compute mean and sample standard deviation in one pass (Welford).
+    
+    Args:
+        values: Non-empty iterable of numbers
+        
+    Returns:
+        Tuple (mean, stdev); stdev is 0.0 for a single value
+    """
+    count = 0
+    mean = 0.0
+    sum_sq_diff = 0.0
+    for value in values:
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        sum_sq_diff += delta * (value - mean)
+    std_dev = math.sqrt(sum_sq_diff / (count - 1)) if count > 1 else 0.0
+    return mean, std_dev
+
+
 class AnalyticsService:
     """Service for calculating analytics and aggregating data efficiently."""
     
@@ -38,7 +61,7 @@ class AnalyticsService:
         Returns:
             List of fastest lap times
         """
-        return sorted(all_times, key=lambda x: x.time_format.total_seconds)[:limit]
+        return heapq.nsmallest(limit, all_times, key=lambda x: x.time_format.total_seconds)
     
     @staticmethod
     def calculate_track_difficulty(track_data: Dict, min_laps: int = 3) -> List[Tuple[str, float, float]]:
@@ -56,8 +79,7 @@ class AnalyticsService:
         
         for track_key, data in track_data.items():
             if data['count'] >= min_laps:
-                times = [t.time_format.total_seconds for t in data['times']]
-                std_dev = statistics.stdev(times) if len(times) > 1 else 0
+                _, std_dev = _mean_and_stdev(t.time_format.total_seconds for t in data['times'])
                 difficulty_score = data['avg'] + (std_dev * 2)
                 difficulty_scores.append((track_key, difficulty_score, data['avg']))
         
@@ -79,8 +101,7 @@ class AnalyticsService:
         
         for username, times in user_performance.items():
             if len(times) >= min_laps:
-                std_dev = statistics.stdev(times)
-                avg_time = statistics.mean(times)
+                avg_time, std_dev = _mean_and_stdev(times)
                 consistency_score = 100 - (std_dev / avg_time * 100)
                 consistency_data.append((username, consistency_score, len(times)))
         
@@ -98,8 +119,8 @@ class AnalyticsService:
         Returns:
             List of tuples (username, lap_count)
         """
-        activity_data = [(username, len(times)) for username, times in user_performance.items()]
-        return sorted(activity_data, key=lambda x: x[1], reverse=True)[:limit]
+        activity_data = ((username, len(times)) for username, times in user_performance.items())
+        return heapq.nlargest(limit, activity_data, key=lambda x: x[1])
     
     @staticmethod
     def calculate_rivalries(
@@ -27,6 +27,26 @@ SKILL_COLORS = {
     "Beginner": discord.Color.light_grey()
 }
 
+# Lap submission embed header (title, description, color); a track record
+# takes precedence over a personal best
+SUBMISSION_HEADERS = {
+    "overall_best": (
+        "🏆 NEW TRACK RECORD!",
+        "Congratulations! You've set a new track record!",
+        discord.Color.gold()
+    ),
+    "personal_best": (
+        "🎯 Personal Best!",
+        "You've improved your personal best time!",
+        discord.Color.green()
+    ),
+    "recorded": (
+        "⏱️ Lap Time Recorded",
+        "Your lap time has been recorded.",
+        discord.Color.blue()
+    )
+}
+
 
 class EmbedBuilder:
     """Helper class for building Discord embeds with common patterns."""
@@ -89,23 +109,13 @@ class EmbedBuilder:
     ) -> discord.Embed:
         """Create embed for lap submission result."""
         if is_overall_best:
-            embed = discord.Embed(
-                title="🏆 NEW TRACK RECORD!",
-                description="Congratulations! You've set a new track record!",
-                color=discord.Color.gold()
-            )
+            header = SUBMISSION_HEADERS["overall_best"]
         elif is_personal_best:
-            embed = discord.Embed(
-                title="🎯 Personal Best!",
-                description="You've improved your personal best time!",
-                color=discord.Color.green()
-            )
+            header = SUBMISSION_HEADERS["personal_best"]
         else:
-            embed = discord.Embed(
-                title="⏱️ Lap Time Recorded",
-                description="Your lap time has been recorded.",
-                color=discord.Color.blue()
-            )
+            header = SUBMISSION_HEADERS["recorded"]
+        title, description, color = header
+        embed = discord.Embed(title=title, description=description, color=color)
         
         embed.add_field(name="Driver", value=lap_time.username, inline=True)
         embed.add_field(name="Time", value=f"`{lap_time.time_format}`", inline=True)
@@ -117,15 +127,16 @@ class EmbedBuilder:
         
         # Add sector times if available
         if lap_time.sector1_ms or lap_time.sector2_ms or lap_time.sector3_ms:
-            sector_text = ""
+            sector_parts = []
             if lap_time.sector1_ms and lap_time.sector1_ms > 0:
-                sector_text += f"S1: `{format_time_func(lap_time.sector1_ms / 1000.0)}`\n"
+                sector_parts.append(f"S1: `{format_time_func(lap_time.sector1_ms / 1000.0)}`\n")
             if lap_time.sector2_ms and lap_time.sector2_ms > 0:
-                sector_text += f"S2: `{format_time_func(lap_time.sector2_ms / 1000.0)}`\n"
+                sector_parts.append(f"S2: `{format_time_func(lap_time.sector2_ms / 1000.0)}`\n")
             if lap_time.sector3_ms and lap_time.sector3_ms > 0:
-                sector_text += f"S3: `{format_time_func(lap_time.sector3_ms / 1000.0)}`"
+                sector_parts.append(f"S3: `{format_time_func(lap_time.sector3_ms / 1000.0)}`")
             
-            if sector_text:
+            if sector_parts:
+                sector_text = "".join(sector_parts)
                 embed.add_field(name="🎯 Sectors", value=sector_text, inline=False)
         
         EmbedBuilder.add_track_visuals(embed, lap_time.track_name)
@@ -153,7 +164,7 @@ class EmbedBuilder:
                 inline=False
             )
         else:
-            leaderboard_text = ""
+            leaderboard_lines = []
             for i, lap_time in enumerate(top_times):
                 position_icon = EmbedBuilder.format_position_icon(i)
                 gap_text = " 🏆" if i == 0 else ""
@@ -163,8 +174,9 @@ class EmbedBuilder:
                     gap_seconds = lap_time.time_format.total_seconds - previous_time.time_format.total_seconds
                     gap_text = f" `(+{gap_seconds:.3f}s)`"
                 
-                leaderboard_text += f"{position_icon} **{lap_time.username}** - `{lap_time.time_format}`{gap_text}\n"
+                leaderboard_lines.append(f"{position_icon} **{lap_time.username}** - `{lap_time.time_format}`{gap_text}\n")
             
+            leaderboard_text = "".join(leaderboard_lines)
             embed.add_field(name="🏆 Leaderboard", value=leaderboard_text, inline=False)
         
         return embed
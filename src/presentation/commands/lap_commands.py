@@ -1,6 +1,6 @@
 """Discord slash commands for lap time management."""
 import discord
-import random
+import heapq
 from discord.ext import commands
 from discord import app_commands
 from typing import Optional
@@ -904,7 +904,7 @@ class LapCommands(commands.Cog):
             from ...domain.value_objects.track_name import TrackName
             
             # Get all track keys
-            all_track_keys = list(TrackName.TRACK_DATA.keys())
+            all_track_keys = TrackName.TRACK_KEYS
             
             embed = discord.Embed(
                 title="🏆 Global F1 Leaderboard",
@@ -927,7 +927,7 @@ class LapCommands(commands.Cog):
                 
                 for track_key in track_chunk:
                     try:
-                        track = TrackName(track_key)
+                        track = TrackName.from_key(track_key)
                         best_time = await self.bot.lap_time_repository.find_best_by_track(track)
                         
                         if best_time:
@@ -977,7 +977,7 @@ class LapCommands(commands.Cog):
             total_drivers = set()
             for track_key in all_track_keys:
                 try:
-                    track = TrackName(track_key)
+                    track = TrackName.from_key(track_key)
                     track_times = await self.bot.lap_time_repository.find_top_by_track(track, 100)  # Get all times
                     all_times.extend(track_times)
                     for time in track_times:
@@ -1045,14 +1045,14 @@ class LapCommands(commands.Cog):
             import statistics
             
             # Get all data for analysis
-            all_track_keys = list(TrackName.TRACK_DATA.keys())
+            all_track_keys = TrackName.TRACK_KEYS
             all_times = []
             track_data = {}
             user_performance = {}
             
             for track_key in all_track_keys:
                 try:
-                    track = TrackName(track_key)
+                    track = TrackName.from_key(track_key)
                     times = await self.bot.lap_time_repository.find_top_by_track(track, 100)
                     if times:
                         all_times.extend(times)
@@ -1060,7 +1060,7 @@ class LapCommands(commands.Cog):
                             'times': times,
                             'best': min(times, key=lambda x: x.time_format.total_seconds),
                             'worst': max(times, key=lambda x: x.time_format.total_seconds),
-                            'avg': statistics.mean([t.time_format.total_seconds for t in times]),
+                            'avg': statistics.fmean([t.time_format.total_seconds for t in times]),
                             'count': len(times)
                         }
                         
@@ -1094,7 +1094,7 @@ class LapCommands(commands.Cog):
             track_leaders = self.analytics.calculate_track_leaders(track_data)
             
             if track_leaders:
-                sorted_leaders = sorted(track_leaders.items(), key=lambda x: x[1], reverse=True)[:5]
+                sorted_leaders = heapq.nlargest(5, track_leaders.items(), key=lambda x: x[1])
                 hall_of_fame_medals = ["👑", "🥇", "🥈", "🥉", "🏅"]
                 hall_of_fame = "\n".join(
                     f"{hall_of_fame_medals[i] if i < len(hall_of_fame_medals) else '🎖️'} **{driver}** - {count} track records"
@@ -1126,7 +1126,7 @@ class LapCommands(commands.Cog):
             if track_difficulty:
                 difficulty_icons = ["💀", "🔥", "⚡", "🌪️", "💥"]
                 hardest_tracks = "\n".join(
-                    f"{difficulty_icons[i] if i < len(difficulty_icons) else '🎯'} **{TrackName(track_key).short_name}** - Avg: `{self._format_time_seconds(avg)}`"
+                    f"{difficulty_icons[i] if i < len(difficulty_icons) else '🎯'} **{TrackName.from_key(track_key).short_name}** - Avg: `{self._format_time_seconds(avg)}`"
                     for i, (track_key, _, avg) in enumerate(track_difficulty[:5])
                 )
                 
@@ -1170,7 +1170,7 @@ class LapCommands(commands.Cog):
             total_unique_drivers = len(user_performance)
             total_laps = len(all_times)
             tracks_with_times = len(track_data)
-            overall_avg = statistics.mean([t.time_format.total_seconds for t in all_times])
+            overall_avg = statistics.fmean([t.time_format.total_seconds for t in all_times])
             
             embed.add_field(
                 name="📊 Global Summary",
@@ -1197,13 +1197,13 @@ class LapCommands(commands.Cog):
             from ...domain.value_objects.track_name import TrackName
             import statistics
             
-            all_track_keys = list(TrackName.TRACK_DATA.keys())
+            all_track_keys = TrackName.TRACK_KEYS
             track_stats = {}
             
             # Collect data for each track
             for track_key in all_track_keys:
                 try:
-                    track = TrackName(track_key)
+                    track = TrackName.from_key(track_key)
                     times = await self.bot.lap_time_repository.find_top_by_track(track, 100)
                     
                     if times:
@@ -1212,7 +1212,7 @@ class LapCommands(commands.Cog):
                             'country': track.country,
                             'count': len(times),
                             'best_time': min(times, key=lambda x: x.time_format.total_seconds),
-                            'avg_time': statistics.mean([t.time_format.total_seconds for t in times]),
+                            'avg_time': statistics.fmean([t.time_format.total_seconds for t in times]),
                             'unique_drivers': len(set(t.username for t in times))
                         }
                     else:
@@ -1319,14 +1319,14 @@ class LapCommands(commands.Cog):
         try:
             from ...domain.value_objects.track_name import TrackName
             
-            all_track_keys = list(TrackName.TRACK_DATA.keys())
+            all_track_keys = TrackName.TRACK_KEYS
             user_track_times = {}  # {username: {track: best_time}}
             rivalries = {}  # {(user1, user2): {'battles': int, 'user1_wins': int, 'user2_wins': int}}
             
             # Collect each user's best time per track
             for track_key in all_track_keys:
                 try:
-                    track = TrackName(track_key)
+                    track = TrackName.from_key(track_key)
                     times = await self.bot.lap_time_repository.find_top_by_track(track, 100)
                     
                     track_user_best = {}
@@ -1573,12 +1573,11 @@ class LapCommands(commands.Cog):
             )
             
             # Add statistics
-            all_ratings = await self.bot.driver_rating_repository.find_all_ratings()
-            if all_ratings:
-                avg_elo = sum(r.current_elo for r in all_ratings) / len(all_ratings)
+            rating_stats = await self.bot.driver_rating_repository.get_rating_statistics()
+            if rating_stats['total_drivers']:
                 embed.add_field(
                     name="📊 League Stats",
-                    value=f"Active drivers: **{len(all_ratings)}**\nAverage ELO: **{avg_elo:.0f}**",
+                    value=f"Active drivers: **{rating_stats['total_drivers']}**\nAverage ELO: **{rating_stats['average_elo']:.0f}**",
                     inline=True
                 )
             
@@ -1645,7 +1644,7 @@ class LapCommands(commands.Cog):
             # Process each track chronologically
             for track_key in available_tracks:
                 try:
-                    track = TrackName(track_key)
+                    track = TrackName.from_key(track_key)
                     
                     # Get all lap times for this track, ordered by creation time
                     all_track_times = await self.bot.lap_time_repository.find_recent_by_track(track, 1000)
@@ -1686,7 +1685,7 @@ class LapCommands(commands.Cog):
             
             for track_key in available_tracks:
                 try:
-                    track = TrackName(track_key)
+                    track = TrackName.from_key(track_key)
                     track_times = await self.bot.lap_time_repository.find_recent_by_track(track, 1000)
                     for lap_time in track_times:
                         all_lap_users.add((lap_time.user_id, lap_time.username))
@@ -1723,7 +1722,7 @@ class LapCommands(commands.Cog):
             
             # Show top 5 ELO ratings
             if final_ratings:
-                top_ratings = sorted(final_ratings, key=lambda x: x.current_elo, reverse=True)[:5]
+                top_ratings = heapq.nlargest(5, final_ratings, key=lambda x: x.current_elo)
                 leaderboard_text = ""
                 for i, rating in enumerate(top_ratings):
                     skill_emoji = self._get_skill_emoji(rating.skill_level)
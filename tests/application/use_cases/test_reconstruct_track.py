@@ -461,3 +461,43 @@ async def test_custom_min_laps_parameter(
     # Execute with min_laps=6 (more than available)
     with pytest.raises(InsufficientDataError):
         await use_case.execute(session_uid=12345, min_laps=6)
+
+
+@pytest.mark.asyncio
+async def test_reuses_profile_for_unchanged_laps(
+    use_case,
+    mock_telemetry_repository,
+    mock_track_reconstructor
+):
+    """Test that reconstruction is skipped when the session's laps are unchanged."""
+    # Setup
+    mock_telemetry_repository.get_session.return_value = {
+        "session_uid": 12345,
+        "track_id": "monaco"
+    }
+    
+    lap_traces = [
+        create_mock_lap_trace(lap_number=i, sample_count=200)
+        for i in range(1, 4)
+    ]
+    mock_telemetry_repository.list_lap_traces.return_value = lap_traces
+    
+    mock_centerline = np.array([[0, 0], [100, 0]])
+    mock_distances = np.array([0, 100])
+    mock_track_reconstructor.compute_centerline.return_value = (mock_centerline, mock_distances)
+    mock_track_reconstructor.compute_curvature.return_value = np.array([0.0, 0.0])
+    mock_track_reconstructor.compute_elevation.return_value = np.array([0.0, 0.0])
+    
+    # Execute twice with the same laps
+    first = await use_case.execute(session_uid=12345)
+    second = await use_case.execute(session_uid=12345)
+    
+    assert second is first
+    assert mock_track_reconstructor.compute_centerline.call_count == 1
+    
+    # A new lap invalidates the cached profile
+    lap_traces.append(create_mock_lap_trace(lap_number=4, sample_count=200))
+    third = await use_case.execute(session_uid=12345)
+    
+    assert third is not first
+    assert mock_track_reconstructor.compute_centerline.call_count == 2
@@ -0,0 +1,184 @@
+"""Unit tests for UpdateEloRatingsUseCase.
+
+Tests cover:
+- A first lap on a track saves the default rating without matches
+- Batched processing produces the same ratings as per-lap processing
+- Batched processing writes all touched ratings in one save_all call
+- Use cases sharing a rating repository never interleave their updates
+"""
+
+import asyncio
+import copy
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.application.use_cases.update_elo_ratings import UpdateEloRatingsUseCase
+from src.domain.entities.lap_time import LapTime
+from src.domain.value_objects.time_format import TimeFormat
+from src.domain.value_objects.track_name import TrackName
+
+
+class InMemoryDriverRatingRepository:
+    """Minimal driver rating store backed by a dict."""
+
+    def __init__(self):
+        self.ratings = {}
+        self.save_all_calls = 0
+
+    async def save(self, driver_rating):
+        self.ratings[driver_rating.user_id] = copy.copy(driver_rating)
+
+    async def save_all(self, driver_ratings):
+        self.save_all_calls += 1
+        for driver_rating in driver_ratings:
+            self.ratings[driver_rating.user_id] = copy.copy(driver_rating)
+
+    async def find_by_user_id(self, user_id):
+        rating = self.ratings.get(user_id)
+        return copy.copy(rating) if rating else None
+
+    async def find_by_user_ids(self, user_ids):
+        return [copy.copy(self.ratings[user_id]) for user_id in user_ids if user_id in self.ratings]
+
+
+class SlowDriverRatingRepository(InMemoryDriverRatingRepository):
+    """Rating store that yields to the event loop on every call."""
+
+    async def save(self, driver_rating):
+        await asyncio.sleep(0)
+        await super().save(driver_rating)
+
+    async def save_all(self, driver_ratings):
+        await asyncio.sleep(0)
+        await super().save_all(driver_ratings)
+
+    async def find_by_user_id(self, user_id):
+        await asyncio.sleep(0)
+        return await super().find_by_user_id(user_id)
+
+    async def find_by_user_ids(self, user_ids):
+        await asyncio.sleep(0)
+        return await super().find_by_user_ids(user_ids)
+
+
+def create_lap(user_id: str, time_string: str, track: str = "monza", minutes_ago: int = 0) -> LapTime:
+    """Helper to create a lap time for a user."""
+    return LapTime(
+        user_id=user_id,
+        username=f"Driver {user_id}",
+        time_format=TimeFormat(time_string),
+        track_name=TrackName(track),
+        lap_id=f"{user_id}-{track}-{time_string}",
+        created_at=datetime.utcnow() - timedelta(minutes=minutes_ago),
+    )
+
+
+@pytest.fixture
+def laps():
+    """Fixture providing laps from three drivers on two tracks, oldest first."""
+    return [
+        create_lap("1", "1:20.000", minutes_ago=60),
+        create_lap("2", "1:20.050", minutes_ago=50),
+        create_lap("3", "1:22.500", minutes_ago=40),
+        create_lap("1", "1:31.000", track="spa", minutes_ago=30),
+        create_lap("3", "1:19.900", minutes_ago=20),
+        create_lap("2", "1:30.400", track="spa", minutes_ago=10),
+    ]
+
+
+def create_lap_time_repository(laps):
+    """Create a lap time repository mock serving the given laps per track."""
+    repository = AsyncMock()
+
+    async def find_top_by_track(track, limit=10):
+        track_laps = [lap for lap in laps if lap.track_name == track]
+        return sorted(track_laps, key=lambda lap: lap.time_format.total_milliseconds)[:limit]
+
+    repository.find_top_by_track.side_effect = find_top_by_track
+    return repository
+
+
+@pytest.mark.asyncio
+async def test_first_lap_saves_default_rating():
+    """A lap without competitors only stores the initial rating."""
+    lap = create_lap("1", "1:20.000")
+    rating_repository = InMemoryDriverRatingRepository()
+    use_case = UpdateEloRatingsUseCase(rating_repository, create_lap_time_repository([lap]))
+
+    rating = await use_case.execute(lap)
+
+    assert rating.current_elo == 1500
+    assert rating.matches_played == 0
+    assert rating_repository.ratings["1"].current_elo == 1500
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_matches_sequential_execute(laps):
+    """Processing laps in a batch yields the same ratings as one at a time."""
+    sequential_repository = InMemoryDriverRatingRepository()
+    sequential = UpdateEloRatingsUseCase(sequential_repository, create_lap_time_repository(laps))
+    for lap in laps:
+        await sequential.execute(lap)
+
+    batch_repository = InMemoryDriverRatingRepository()
+    batch = UpdateEloRatingsUseCase(batch_repository, create_lap_time_repository(laps))
+    await batch.execute_batch(laps[:2])
+    await batch.execute_batch(laps[2:])
+
+    assert sequential_repository.ratings.keys() == batch_repository.ratings.keys()
+    assert any(rating.matches_played for rating in sequential_repository.ratings.values())
+    for user_id, expected in sequential_repository.ratings.items():
+        actual = batch_repository.ratings[user_id]
+        assert actual.current_elo == expected.current_elo
+        assert actual.peak_elo == expected.peak_elo
+        assert actual.wins == expected.wins
+        assert actual.losses == expected.losses
+        assert actual.matches_played == expected.matches_played
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_saves_once(laps):
+    """All touched ratings are written back in a single save_all call."""
+    rating_repository = InMemoryDriverRatingRepository()
+    use_case = UpdateEloRatingsUseCase(rating_repository, create_lap_time_repository(laps))
+
+    updated = await use_case.execute_batch(laps)
+
+    assert rating_repository.save_all_calls == 1
+    assert [rating.user_id for rating in updated] == [lap.user_id for lap in laps]
+    assert set(rating_repository.ratings) == {"1", "2", "3"}
+
+
+def test_use_cases_share_lock_per_rating_repository():
+    """Instances over the same rating repository share one lock."""
+    rating_repository = InMemoryDriverRatingRepository()
+    first = UpdateEloRatingsUseCase(rating_repository, AsyncMock())
+    second = UpdateEloRatingsUseCase(rating_repository, AsyncMock())
+    other = UpdateEloRatingsUseCase(InMemoryDriverRatingRepository(), AsyncMock())
+
+    assert first._ratings_lock is second._ratings_lock
+    assert first._ratings_lock is not other._ratings_lock
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_do_not_overwrite_each_other(laps):
+    """A batch and a single update running together match running them in turn."""
+    lap_time_repository = create_lap_time_repository(laps)
+
+    sequential_repository = InMemoryDriverRatingRepository()
+    sequential = UpdateEloRatingsUseCase(sequential_repository, lap_time_repository)
+    await sequential.execute_batch(laps[:3])
+    await sequential.execute(laps[4])
+
+    concurrent_repository = SlowDriverRatingRepository()
+    batch = UpdateEloRatingsUseCase(concurrent_repository, lap_time_repository)
+    single = UpdateEloRatingsUseCase(concurrent_repository, lap_time_repository)
+    await asyncio.gather(batch.execute_batch(laps[:3]), single.execute(laps[4]))
+
+    assert concurrent_repository.ratings.keys() == sequential_repository.ratings.keys()
+    for user_id, expected in sequential_repository.ratings.items():
+        actual = concurrent_repository.ratings[user_id]
+        assert actual.current_elo == expected.current_elo
+        assert actual.matches_played == expected.matches_played
@@ -441,6 +441,24 @@ class TestTrackReconstructor:
         
         # Last distance should be > 0
         assert distances[-1] > 0, "Final distance should be positive"
+    
+    def test_median_per_bin_matches_numpy_median(self):
+        """Test that per-bin medians match np.median over each bin's samples."""
+        rng = np.random.default_rng(42)
+        num_bins = 50
+        # Leave a few bins empty and mix odd and even bin sizes
+        bin_indices = rng.integers(0, num_bins - 5, size=1001)
+        values = rng.normal(size=1001)
+        
+        occupied_bins, medians = self.reconstructor._median_per_bin(
+            bin_indices, values, num_bins
+        )
+        
+        expected_bins = np.unique(bin_indices)
+        expected_medians = [np.median(values[bin_indices == b]) for b in expected_bins]
+        
+        np.testing.assert_array_equal(occupied_bins, expected_bins)
+        np.testing.assert_array_equal(medians, expected_medians)
 
 
 class TestTrackReconstructorCurvature:
@@ -0,0 +1,170 @@
+"""Tests for the shared-connection handling of SQLiteLapTimeRepository.
+
+This test suite validates:
+- The connection is opened lazily, once, and reused
+- A failed write rolls back and releases the lock
+- Reads wait for an open write transaction instead of seeing its rows
+- close() releases the connection and a later call reopens it
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.domain.entities.lap_time import LapTime
+from src.domain.value_objects.time_format import TimeFormat
+from src.domain.value_objects.track_name import TrackName
+from src.infrastructure.persistence.sqlite_lap_time_repository import SQLiteLapTimeRepository
+
+
+@pytest_asyncio.fixture
+async def repository():
+    """Create a repository on a temporary database and close it afterwards."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp:
+        db_path = tmp.name
+
+    repo = SQLiteLapTimeRepository(db_path)
+    yield repo
+
+    # Cleanup
+    await repo.close()
+    for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def make_lap(user_id: str = "user1", time_string: str = "1:23.456") -> LapTime:
+    """Create a lap time on Monaco for the given user."""
+    return LapTime(
+        user_id=user_id,
+        username=f"Driver {user_id}",
+        time_format=TimeFormat(time_string),
+        track_name=TrackName("monaco"),
+    )
+
+
+async def count_laps(repo: SQLiteLapTimeRepository) -> int:
+    """Count stored laps through the repository's read path."""
+    async with repo._reader() as db:
+        cursor = await db.execute("SELECT COUNT(*) FROM lap_times")
+        return (await cursor.fetchone())[0]
+
+
+class TestLazyConnection:
+    """Test suite for lazy opening of the shared connection."""
+
+    @pytest.mark.asyncio
+    async def test_connection_not_opened_on_init(self, repository):
+        """Verify constructing the repository does not touch the database."""
+        assert repository._connection is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_use_opens_one_connection(self, repository):
+        """Verify concurrent first calls share a single connection."""
+        connections = await asyncio.gather(
+            *(repository._get_connection() for _ in range(5))
+        )
+
+        assert all(conn is connections[0] for conn in connections)
+        assert repository._connection is connections[0]
+
+    @pytest.mark.asyncio
+    async def test_operations_reuse_connection(self, repository):
+        """Verify reads and writes run on the same connection."""
+        lap_id = await repository.save(make_lap())
+        connection = repository._connection
+
+        stored = await repository.find_by_id(lap_id)
+
+        assert stored is not None
+        assert repository._connection is connection
+
+
+class TestAccessLock:
+    """Test suite for the lock guarding the shared connection."""
+
+    @pytest.mark.asyncio
+    async def test_failed_write_rolls_back(self, repository):
+        """Verify an exception inside a write discards its changes."""
+        await repository.save(make_lap("user1"))
+
+        with pytest.raises(RuntimeError):
+            async with repository._writer() as db:
+                await db.execute("DELETE FROM lap_times")
+                raise RuntimeError("write failed")
+
+        assert not repository._access_lock.locked()
+        assert await count_laps(repository) == 1
+
+    @pytest.mark.asyncio
+    async def test_read_waits_for_open_write(self, repository):
+        """Verify a read never observes an uncommitted write."""
+        await repository._ensure_table_exists()
+        write_started = asyncio.Event()
+        release_write = asyncio.Event()
+
+        async def failing_write():
+            async with repository._writer() as db:
+                await db.execute(
+                    "INSERT INTO lap_times (lap_id, user_id, username, track_key, "
+                    "time_minutes, time_seconds, time_milliseconds, total_milliseconds, "
+                    "created_at) VALUES ('tmp', 'u', 'U', 'monaco', 1, 23, 456, 83456, '2025-01-01')"
+                )
+                write_started.set()
+                await release_write.wait()
+                raise RuntimeError("write failed")
+
+        write_task = asyncio.create_task(failing_write())
+        await write_started.wait()
+        read_task = asyncio.create_task(count_laps(repository))
+
+        # The read must be blocked while the write transaction is open
+        await asyncio.sleep(0.05)
+        assert not read_task.done()
+
+        release_write.set()
+        with pytest.raises(RuntimeError):
+            await write_task
+
+        assert await read_task == 0
+
+
+class TestClose:
+    """Test suite for releasing the shared connection."""
+
+    @pytest.mark.asyncio
+    async def test_close_without_open_is_noop(self, repository):
+        """Verify close() before first use does nothing."""
+        await repository.close()
+
+        assert repository._connection is None
+
+    @pytest.mark.asyncio
+    async def test_close_releases_connection(self, repository):
+        """Verify close() drops the connection and schema flag."""
+        await repository.save(make_lap())
+
+        await repository.close()
+
+        assert repository._connection is None
+        assert repository._schema_ready is False
+
+    @pytest.mark.asyncio
+    async def test_reopens_after_close(self, repository):
+        """Verify the repository reopens the database after close()."""
+        lap_id = await repository.save(make_lap())
+        await repository.close()
+
+        stored = await repository.find_by_id(lap_id)
+
+        assert stored is not None
+        assert stored.user_id == "user1"
+        assert repository._connection is not None
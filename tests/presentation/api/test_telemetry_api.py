@@ -0,0 +1,97 @@
+"""Tests for the background ELO update worker of TelemetryAPI.
+
+This test suite validates:
+- Laps queued together are applied in one batch, in submission order
+- A failing batch is logged and does not stop the worker
+- stop() drains the queue before cancelling the worker
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from src.presentation.api.telemetry_api import TelemetryAPI
+
+
+@pytest.fixture
+def api():
+    """Create a TelemetryAPI with mocked repositories and ELO use case."""
+    telemetry_api = TelemetryAPI(AsyncMock(), AsyncMock())
+    telemetry_api.update_elo_use_case = Mock()
+    telemetry_api.update_elo_use_case.execute_batch = AsyncMock()
+    return telemetry_api
+
+
+def make_lap(lap_id: str) -> SimpleNamespace:
+    """Create a stand-in lap time carrying only its ID."""
+    return SimpleNamespace(lap_id=lap_id)
+
+
+def start_worker(telemetry_api: TelemetryAPI) -> None:
+    """Start the ELO worker the way start() does, without the HTTP server."""
+    telemetry_api._elo_task = asyncio.create_task(telemetry_api._elo_update_worker())
+
+
+@pytest.mark.asyncio
+async def test_worker_coalesces_queued_laps(api):
+    """Laps waiting in the queue are applied together, oldest first."""
+    laps = [make_lap(f"lap-{i}") for i in range(3)]
+    for lap in laps:
+        api._elo_queue.put_nowait(lap)
+
+    start_worker(api)
+    await api._elo_queue.join()
+
+    api.update_elo_use_case.execute_batch.assert_awaited_once_with(laps)
+    await api.stop()
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_failed_batch(api):
+    """A failing batch is logged and later laps are still applied."""
+    api.update_elo_use_case.execute_batch.side_effect = [RuntimeError("db locked"), None]
+    api.logger = Mock()
+    start_worker(api)
+
+    api._elo_queue.put_nowait(make_lap("lap-1"))
+    await api._elo_queue.join()
+    api._elo_queue.put_nowait(make_lap("lap-2"))
+    await api._elo_queue.join()
+
+    assert api.update_elo_use_case.execute_batch.await_count == 2
+    api.logger.error.assert_called_once()
+    assert "lap-1" in api.logger.error.call_args.args
+    assert not api._elo_task.done()
+    await api.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue_before_cancelling(api):
+    """stop() waits for queued laps, then cancels and clears the worker."""
+    applied = []
+
+    async def slow_batch(lap_times):
+        await asyncio.sleep(0.01)
+        applied.extend(lap_times)
+
+    api.update_elo_use_case.execute_batch.side_effect = slow_batch
+    start_worker(api)
+    worker = api._elo_task
+    laps = [make_lap(f"lap-{i}") for i in range(5)]
+    for lap in laps:
+        api._elo_queue.put_nowait(lap)
+
+    await api.stop()
+
+    assert applied == laps
+    assert api._elo_queue.empty()
+    assert api._elo_task is None
+    await asyncio.sleep(0)
+    assert worker.cancelled()